@@ -0,0 +1,115 @@
+"""
+Weighted sampling with Vose's alias method.
+
+Building the tables takes O(n); after that every draw costs one random index
+and one random number, no matter how many outcomes there are or how skewed
+the weights are. Used for both the rarity roll and per-person weights within
+a tier.
+"""
+
+import random
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+class AliasSampler(Generic[T]):
+    """
+    Precomputed alias tables for a fixed set of weighted outcomes.
+
+    Args:
+        items: The outcomes to draw from
+        weights: Non-negative weight per outcome (need not sum to 1)
+
+    Raises:
+        ValueError: If the lists differ in length, a weight is negative,
+            or all weights are zero
+    """
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have the same length")
+        if not items:
+            raise ValueError("Cannot sample from an empty list")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights must not be negative")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+
+        self.items: List[T] = list(items)
+        self.weights = tuple(float(weight) for weight in weights)
+        self.probabilities = [weight / total for weight in self.weights]
+        self._prob, self._alias = self._build(self.probabilities)
+        self._arrays: Optional[tuple] = None
+
+    @classmethod
+    def from_dict(cls, weights: Dict[T, float]) -> "AliasSampler[T]":
+        """Build a sampler from an {outcome: weight} mapping."""
+        return cls(list(weights.keys()), list(weights.values()))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @staticmethod
+    def _build(probabilities: List[float]) -> tuple:
+        """Vose's alias method: split every column into its own outcome and one alias."""
+        n = len(probabilities)
+        scaled = [p * n for p in probabilities]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # Whatever is left is 1.0 up to rounding error
+        for i in large + small:
+            prob[i] = 1.0
+        return prob, alias
+
+    def sample_index(self, rng: Any = random) -> int:
+        """
+        Draw one outcome index.
+
+        Args:
+            rng: Source of randomness with randrange() and random()
+                (the random module or a random.Random instance)
+        """
+        column = rng.randrange(len(self._prob))
+        return column if rng.random() < self._prob[column] else self._alias[column]
+
+    def sample(self, rng: Any = random) -> T:
+        """Draw one outcome."""
+        return self.items[self.sample_index(rng)]
+
+    def draw_indices(self, k: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Draw k outcome indices in one vectorised pass.
+
+        Args:
+            k (int): Number of draws
+            rng (numpy.random.Generator, optional): Generator to use (default: a fresh one)
+
+        Returns:
+            numpy.ndarray: k indices into `items`
+        """
+        if self._arrays is None:
+            self._arrays = (np.array(self._prob), np.array(self._alias, dtype=np.intp))
+        prob, alias = self._arrays
+        rng = rng if rng is not None else np.random.default_rng()
+
+        columns = rng.integers(0, len(prob), size=k)
+        keep = rng.random(k) < prob[columns]
+        return np.where(keep, columns, alias[columns])
+
+    def draw(self, k: int, rng: Optional[np.random.Generator] = None) -> List[T]:
+        """Draw k outcomes in one vectorised pass."""
+        return [self.items[i] for i in self.draw_indices(k, rng)]
@@ -0,0 +1,163 @@
+"""
+Benchmark of the people/receipts indexes added in pb/pb_migrations.
+
+Builds a throwaway SQLite database shaped like PocketBase's `people` and
+`receipts` tables, runs the queries the app makes (tier counts, server-side
+picks, pity recovery, receipts per person) without indexes, then creates the
+indexes from the migrations and runs them again.
+
+    python benchmark_indexes.py --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from getRandomPerson import RARITY_WEIGHTS
+
+# --- Configuration ---
+DEFAULT_ROWS = 100_000
+DEFAULT_REPEAT = 20  # Runs per query, the median is reported
+
+# Same statements as 1791993600_updated_people.js and 1791993601_updated_receipts.js
+INDEXES = [
+    "CREATE INDEX `idx_people_rarity` ON `people` (`rarity`, `id`)",
+    "CREATE INDEX `idx_receipts_person` ON `receipts` (`person`)",
+    "CREATE INDEX `idx_receipts_created` ON `receipts` (`created`)",
+]
+
+def random_id(rng: random.Random) -> str:
+    """A 15 character ID like PocketBase generates."""
+    return "".join(rng.choices(string.ascii_lowercase + string.digits, k=15))
+
+def create_database(path: str, rows: int, seed: int) -> Tuple[sqlite3.Connection, List[str]]:
+    """
+    Create and fill the tables.
+
+    Returns:
+        tuple: (connection, list of people IDs)
+    """
+    rng = random.Random(seed)
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE people (
+            id TEXT PRIMARY KEY NOT NULL, name TEXT DEFAULT '' NOT NULL,
+            rarity TEXT DEFAULT '' NOT NULL, description TEXT DEFAULT '' NOT NULL,
+            created TEXT DEFAULT '' NOT NULL, updated TEXT DEFAULT '' NOT NULL
+        )
+    """)
+    db.execute("""
+        CREATE TABLE receipts (
+            id TEXT PRIMARY KEY NOT NULL, person TEXT DEFAULT '' NOT NULL,
+            reason TEXT DEFAULT '' NOT NULL,
+            created TEXT DEFAULT '' NOT NULL, updated TEXT DEFAULT '' NOT NULL
+        )
+    """)
+
+    rarities = list(RARITY_WEIGHTS.keys())
+    weights = list(RARITY_WEIGHTS.values())
+    people_ids = [random_id(rng) for _ in range(rows)]
+    timestamp = "2025-01-01 00:00:00.000Z"
+    db.executemany(
+        "INSERT INTO people VALUES (?, ?, ?, ?, ?, ?)",
+        ((person_id, f"Person {i}", rng.choices(rarities, weights)[0], "x" * 200, timestamp, timestamp)
+         for i, person_id in enumerate(people_ids))
+    )
+
+    start = time.mktime((2025, 1, 1, 0, 0, 0, 0, 0, -1))
+    receipts = []
+    for i in range(rows):
+        created = time.strftime("%Y-%m-%d %H:%M:%S.000Z", time.gmtime(start + i * 7))
+        receipts.append((random_id(rng), rng.choice(people_ids), "other", created, created))
+    db.executemany("INSERT INTO receipts VALUES (?, ?, ?, ?, ?)", receipts)
+    db.commit()
+    db.execute("ANALYZE")
+    return db, people_ids
+
+def build_queries(people_ids: List[str], seed: int) -> Dict[str, Tuple[str, Callable[[], tuple]]]:
+    """The app's queries, as PocketBase runs them, with a parameter generator each."""
+    rng = random.Random(seed)
+    rarities = list(RARITY_WEIGHTS.keys())
+    return {
+        "tier count (rarity=S)": (
+            "SELECT COUNT(*) FROM people WHERE rarity = ?",
+            lambda: ("S",)
+        ),
+        "tier page (rarity=A, 500 rows)": (
+            "SELECT * FROM people WHERE rarity = ? LIMIT 500",
+            lambda: ("A",)
+        ),
+        "server-side pick (perPage=1&page=k)": (
+            "SELECT * FROM people WHERE rarity = ? ORDER BY id LIMIT 1 OFFSET ?",
+            lambda: ("B", rng.randrange(1000))
+        ),
+        "receipts by person": (
+            "SELECT * FROM receipts WHERE person = ?",
+            lambda: (rng.choice(people_ids),)
+        ),
+        "latest receipts (sort=-created)": (
+            "SELECT * FROM receipts ORDER BY created DESC LIMIT 50",
+            lambda: ()
+        ),
+        "receipts per rarity (join)": (
+            "SELECT COUNT(*) FROM receipts JOIN people ON people.id = receipts.person WHERE people.rarity = ?",
+            lambda: (rng.choice(rarities),)
+        ),
+    }
+
+def time_query(db: sqlite3.Connection, sql: str, params: Callable[[], tuple], repeat: int) -> float:
+    """Median run time of a query in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        args = params()
+        start = time.perf_counter()
+        db.execute(sql, args).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def run_all(db: sqlite3.Connection, queries: Dict[str, tuple], repeat: int) -> Dict[str, float]:
+    return {name: time_query(db, sql, params, repeat) for name, (sql, params) in queries.items()}
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark the people/receipts indexes')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS,
+                       help=f'People and receipts rows to generate (default: {DEFAULT_ROWS:,})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                       help=f'Runs per query (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the generated data (default: 1)')
+    return parser.parse_args()
+
+def main():
+    """Build the dataset and compare query latency without and with the indexes."""
+    args = parse_arguments()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Generating {args.rows:,} people and {args.rows:,} receipts...")
+        db, people_ids = create_database(os.path.join(directory, "bench.db"), args.rows, args.seed)
+
+        queries = build_queries(people_ids, args.seed)
+        print("Running queries without indexes...")
+        before = run_all(db, queries, args.repeat)
+
+        for statement in INDEXES:
+            db.execute(statement)
+        db.execute("ANALYZE")
+        print("Running queries with indexes...")
+        after = run_all(db, queries, args.repeat)
+        db.close()
+
+    print(f"\n{'Query':<38}{'No index':>12}{'Indexed':>12}{'Speedup':>10}")
+    print("-" * 72)
+    for name in queries:
+        speedup = before[name] / after[name] if after[name] > 0 else float("inf")
+        print(f"{name:<38}{before[name]:>10.3f}ms{after[name]:>10.3f}ms{speedup:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Long-lived camera service.
+
+The camera is opened and configured once when the app starts and kept running,
+so auto-exposure and auto-white-balance stay converged between receipts. A
+background health check reopens the camera if it stops delivering frames.
+
+The camera runs two streams: the full-resolution "main" stream, which is only
+read at the shutter moment, and a small "lores" stream for the live preview.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+# --- Configuration ---
+WARMUP_SECONDS = 2.0  # Time for AE/AWB to converge after the camera starts
+HEALTH_CHECK_INTERVAL = 5.0  # Seconds between background health checks
+HEALTH_CHECK_TIMEOUT = 2.0  # Seconds to wait for a frame before the camera is considered stuck
+REINIT_BACKOFF = 3.0  # Seconds to wait before retrying a failed camera start
+ARCHIVE_JPEG_QUALITY = 90  # JPEG quality for archived captures
+PREVIEW_WIDTH = 400  # Width of the low-resolution preview stream (height follows the sensor aspect ratio)
+PREVIEW_ERROR_BACKOFF = 0.2  # Seconds to pause after a failed preview frame
+
+class CameraService:
+    """
+    Keeps a single Picamera2 instance running for the lifetime of the app.
+
+    Use `session()` to borrow the camera; access is serialized with a lock so
+    the health check and receipt captures never use the camera at the same
+    time. Any error raised while the camera is borrowed marks it unhealthy and
+    it is reopened before the next use.
+    """
+
+    def __init__(self, warmup: float = WARMUP_SECONDS,
+                 health_interval: float = HEALTH_CHECK_INTERVAL):
+        self.warmup = warmup
+        self.health_interval = health_interval
+        self.picam2 = None
+        self.preview_size = None
+        self.ready = threading.Event()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._healthy = False
+        self._last_failure: Optional[float] = None
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def healthy(self) -> bool:
+        """True if the camera is running and delivered a frame on the last check."""
+        return self._healthy and self.ready.is_set()
+
+    def start(self) -> bool:
+        """
+        Open, configure and start the camera, then wait for AE/AWB to settle.
+
+        Returns:
+            bool: True if the camera is running
+        """
+        from picamera2 import Picamera2
+
+        with self._lock:
+            self._close()
+            try:
+                print("Initializing camera...")
+                self.picam2 = Picamera2()
+                self.preview_size = self._preview_size(self.picam2.sensor_resolution)
+                # YUV420 is the lores format supported on every Pi; its Y plane is a ready-made grayscale frame
+                config = self.picam2.create_still_configuration(
+                    lores={"size": self.preview_size, "format": "YUV420"}
+                )
+                self.picam2.configure(config)
+                self.picam2.start()
+                print("Camera started, waiting for auto-adjustment...")
+                time.sleep(self.warmup)  # Let camera adjust to lighting conditions
+            except Exception as e:
+                print(f"Camera start failed: {e}")
+                self._last_failure = time.monotonic()
+                self._close()
+                return False
+
+            self._healthy = True
+            self._last_failure = None
+            self.ready.set()
+            print("Camera ready")
+            return True
+
+    def start_async(self) -> None:
+        """Start the camera and the health monitor in the background."""
+        if self._monitor is not None and self._monitor.is_alive():
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._run_monitor, daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        """Stop the health monitor and close the camera."""
+        self._stop.set()
+        with self._lock:
+            self._close()
+
+    def check_health(self) -> bool:
+        """Wait for one frame's metadata to confirm the camera is still delivering frames."""
+        with self._lock:
+            if self.picam2 is None:
+                self._healthy = False
+                return False
+            try:
+                job = self.picam2.capture_metadata(wait=False)
+                self.picam2.wait(job, timeout=HEALTH_CHECK_TIMEOUT)
+                self._healthy = True
+            except Exception as e:
+                print(f"Camera health check failed: {e}")
+                self._healthy = False
+            return self._healthy
+
+    def ensure_running(self) -> bool:
+        """Restart the camera if it is not running or failed its last check."""
+        with self._lock:
+            if self.picam2 is not None and self._healthy:
+                return True
+            print("Camera not healthy, reinitializing...")
+            return self.start()
+
+    @contextmanager
+    def session(self) -> Iterator[object]:
+        """
+        Borrow the running camera.
+
+        Raises:
+            RuntimeError: If the camera could not be started
+        """
+        with self._lock:
+            if not self.ensure_running():
+                raise RuntimeError("Camera is not available")
+            try:
+                yield self.picam2
+            except Exception:
+                self._healthy = False
+                raise
+
+    def capture_preview(self):
+        """
+        Grab the latest low-resolution preview frame as a grayscale PIL image.
+
+        Does not take the service lock, so the preview can keep running while
+        a capture session is borrowed by another thread.
+        """
+        from PIL import Image
+
+        picam2 = self.picam2
+        if picam2 is None or self.preview_size is None:
+            raise RuntimeError("Camera is not running")
+        width, height = self.preview_size
+        array = picam2.capture_array("lores")
+        # The YUV420 buffer stacks the Y plane on top of the U/V planes and may be padded
+        return Image.fromarray(array[:height, :width], 'L')
+
+    @staticmethod
+    def _preview_size(sensor_resolution) -> tuple:
+        """Preview stream size with the sensor's aspect ratio, rounded to even numbers."""
+        sensor_width, sensor_height = sensor_resolution
+        height = int(PREVIEW_WIDTH * sensor_height / sensor_width)
+        return (PREVIEW_WIDTH - PREVIEW_WIDTH % 2, height - height % 2)
+
+    def _run_monitor(self) -> None:
+        """Background loop: start the camera, then keep checking it."""
+        self.ensure_running()
+        while not self._stop.wait(self.health_interval):
+            if self._last_failure is not None and time.monotonic() - self._last_failure < REINIT_BACKOFF:
+                continue
+            if self.picam2 is None or not self.check_health():
+                self.ensure_running()
+
+    def _close(self) -> None:
+        """Stop and close the camera, ignoring errors from a broken device."""
+        self.ready.clear()
+        self._healthy = False
+        if self.picam2 is not None:
+            try:
+                self.picam2.stop()
+                self.picam2.close()
+                print("Camera properly closed")
+            except Exception as e:
+                print(f"Warning: Error during camera cleanup: {e}")
+            self.picam2 = None
+            self.preview_size = None
+
+class PreviewProducer:
+    """
+    Background thread that captures preview frames into a latest-frame slot.
+
+    The producer captures and prepares frames off the UI thread; the UI only
+    picks up the newest ready frame. Frames replaced before the UI took them
+    are counted as dropped.
+    """
+
+    def __init__(self, camera: CameraService, display_size: Optional[tuple] = None):
+        self.camera = camera
+        self.display_size = display_size
+        self.dropped = 0
+        self.fps = 0.0
+        self._frame = None
+        self._consumed = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start producing frames."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop producing frames (does not wait for the current capture to finish)."""
+        self._stop.set()
+
+    def latest(self):
+        """
+        Take the newest frame if it has not been taken yet.
+
+        Returns:
+            PIL.Image or None: The newest frame, or None if there is no new frame
+        """
+        with self._lock:
+            if self._consumed:
+                return None
+            self._consumed = True
+            return self._frame
+
+    def _run(self) -> None:
+        window_start = time.monotonic()
+        window_frames = 0
+        while not self._stop.is_set():
+            try:
+                frame = self.camera.capture_preview()
+                if self.display_size is not None:
+                    frame.thumbnail(self.display_size)
+            except Exception as e:
+                print(f"Preview update error: {e}")
+                self._stop.wait(PREVIEW_ERROR_BACKOFF)
+                continue
+
+            with self._lock:
+                if not self._consumed:
+                    self.dropped += 1
+                self._frame = frame
+                self._consumed = False
+
+            # Frames per second over roughly the last second
+            window_frames += 1
+            elapsed = time.monotonic() - window_start
+            if elapsed >= 1.0:
+                self.fps = window_frames / elapsed
+                window_start = time.monotonic()
+                window_frames = 0
+
+# Shared camera service for the whole process
+_camera_service: Optional[CameraService] = None
+
+def get_camera_service() -> CameraService:
+    """Get the process-wide camera service, creating it on first use."""
+    global _camera_service
+    if _camera_service is None:
+        _camera_service = CameraService()
+    return _camera_service
+
+# Single background writer so archiving never delays a receipt
+_archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-archive")
+
+def _save_capture(image, directory: str, filename: str) -> None:
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename)
+        image.convert("RGB").save(path, "JPEG", quality=ARCHIVE_JPEG_QUALITY)
+        print(f"Capture archived as {path}")
+    except Exception as e:
+        print(f"Warning: Could not archive capture: {e}")
+
+def archive_capture_async(image, directory: str) -> None:
+    """Save a copy of a captured PIL image as a timestamped JPEG in the background."""
+    filename = datetime.now().strftime("capture_%Y%m%d_%H%M%S_%f.jpg")
+    _archive_executor.submit(_save_capture, image, directory, filename)
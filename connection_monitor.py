@@ -0,0 +1,69 @@
+"""
+Background PocketBase connection monitor.
+
+Probes the database on a fixed interval and keeps the result, so the receipt
+flow can read the current connection state without a network round-trip.
+"""
+
+import threading
+from typing import Callable, Optional
+
+# --- Configuration ---
+PROBE_INTERVAL = 5.0  # Seconds between health checks
+
+class ConnectionMonitor:
+    """
+    Runs `probe()` in a background thread and caches the result.
+
+    Args:
+        probe: Function returning True if the database is reachable
+        interval (float): Seconds between probes
+        on_change: Called as on_change(connected) from the monitor thread
+            whenever the state changes (including the first probe)
+    """
+
+    def __init__(self, probe: Callable[[], bool], interval: float = PROBE_INTERVAL,
+                 on_change: Optional[Callable[[bool], None]] = None):
+        self.probe = probe
+        self.interval = interval
+        self.on_change = on_change
+        self.connected: Optional[bool] = None  # None until the first probe has finished
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start probing in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop probing."""
+        self._stop.set()
+        self._wake.set()
+
+    def probe_now(self) -> None:
+        """Ask the monitor to probe immediately instead of waiting for the interval."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connected = bool(self.probe())
+            except Exception as e:
+                print(f"Connection probe error: {e}")
+                connected = False
+
+            if connected != self.connected:
+                self.connected = connected
+                if self.on_change is not None:
+                    try:
+                        self.on_change(connected)
+                    except Exception as e:
+                        print(f"Connection status callback error: {e}")
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -1,10 +1,21 @@
+import argparse
 import random
+import sqlite3
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from alias_sampler import AliasSampler
+from pity import PITY_RARITIES, PITY_THRESHOLD, PityTracker, pity_weights
+from pocketbase_client import POCKETBASE_URL, fetch_records_page, get_client, iter_records
+from rng_engine import RandomEngine
+from roster_replica import PERSON_WEIGHT_FIELD, RosterReplica
 
 # PocketBase configuration
-POCKETBASE_URL = "http://localhost:8090"
-API_URL = f"{POCKETBASE_URL}/api"
 COLLECTION_NAME = "people"
 
 # Rarity weights (higher weight = more common)
@@ -18,18 +29,66 @@ RARITY_WEIGHTS = {
     "S": 0.5  # Mythic
 }
 
-def get_weighted_rarity() -> str:
+# People without the optional weight field (PERSON_WEIGHT_FIELD) get this weight
+DEFAULT_PERSON_WEIGHT = 1.0
+
+# Roster cache configuration
+ROSTER_CACHE_TTL = 300  # Seconds before the cached roster is reloaded from PocketBase
+ROSTER_RETRY_INTERVAL = 10  # Seconds to wait before retrying a failed roster load
+
+# Server-side selection configuration
+TIER_COUNT_TTL = 60  # Seconds a cached per-rarity record count is trusted
+
+_rarity_sampler: Optional[AliasSampler] = None
+
+def get_rarity_sampler() -> AliasSampler:
+    """
+    Get the alias sampler for RARITY_WEIGHTS.
+    
+    The tables are built once and only rebuilt if RARITY_WEIGHTS has changed.
+    """
+    global _rarity_sampler
+    weights = tuple(RARITY_WEIGHTS.items())
+    sampler = _rarity_sampler
+    if sampler is None or tuple(zip(sampler.items, sampler.weights)) != weights:
+        sampler = AliasSampler.from_dict(RARITY_WEIGHTS)
+        _rarity_sampler = sampler
+    return sampler
+
+def get_weighted_rarity(rng: Any = random) -> str:
     """
     Randomly select a rarity based on weighted probabilities.
     
+    Args:
+        rng: Random source (the random module or a random.Random instance)
+    
     Returns:
         str: The selected rarity (E, D, C, B, A, or S)
     """
-    rarities = list(RARITY_WEIGHTS.keys())
-    weights = list(RARITY_WEIGHTS.values())
-    print(f"Rarities: {rarities} \nweights: {weights}")
+    return get_rarity_sampler().sample(rng)
+
+def build_person_sampler(people: list) -> Optional[AliasSampler]:
+    """
+    Build an alias sampler over people using their optional weight field.
     
-    return random.choices(rarities, weights=weights, k=1)[0]
+    Returns:
+        AliasSampler or None: None if all people have the same weight,
+            in which case a uniform choice is already O(1)
+    """
+    weights = []
+    for person in people:
+        try:
+            weights.append(float(person.get(PERSON_WEIGHT_FIELD) or DEFAULT_PERSON_WEIGHT))
+        except (TypeError, ValueError):
+            weights.append(DEFAULT_PERSON_WEIGHT)
+    
+    if not people or len(set(weights)) == 1:
+        return None
+    try:
+        return AliasSampler(people, weights)
+    except ValueError as e:
+        print(f"Warning: Ignoring person weights: {e}")
+        return None
 
 def get_people_by_rarity(rarity: str) -> list:
     """
@@ -44,57 +103,495 @@ def get_people_by_rarity(rarity: str) -> list:
     try:
         # Create filter for the specific rarity
         filter_param = f'rarity="{rarity}"'
-        
-        response = requests.get(
-            f"{API_URL}/collections/{COLLECTION_NAME}/records",
-            params={"filter": filter_param},
-            headers={"Content-Type": "application/json"}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("items", [])
-        else:
-            print(f"Error fetching people with rarity {rarity}: {response.status_code}")
-            return []
+        return list(iter_records(COLLECTION_NAME, filter_param))
             
     except requests.exceptions.RequestException as e:
-        print(f"Network error while fetching people: {e}")
+        print(f"Error fetching people with rarity {rarity}: {e}")
         return []
 
-def get_random_person() -> Optional[Dict[str, Any]]:
+_tier_counts: Dict[str, tuple] = {}  # rarity -> (count, fetched at)
+_tier_counts_lock = threading.Lock()
+
+def get_tier_count(rarity: str, refresh: bool = False) -> Optional[int]:
+    """
+    Number of people with the given rarity, cached for TIER_COUNT_TTL seconds.
+    
+    Returns:
+        int or None: The count, or None if PocketBase could not be reached
+    """
+    now = time.monotonic()
+    with _tier_counts_lock:
+        cached = _tier_counts.get(rarity)
+    if cached is not None and not refresh and now - cached[1] < TIER_COUNT_TTL:
+        return cached[0]
+    
+    try:
+        # One record with only its ID - the response's totalItems is what we need
+        page = fetch_records_page(COLLECTION_NAME, 1, per_page=1, filter_param=f'rarity="{rarity}"',
+                                  skip_total=False, fields="id")
+    except requests.exceptions.RequestException as e:
+        print(f"Error counting people with rarity {rarity}: {e}")
+        return None
+    
+    count = page.get("totalItems", 0)
+    with _tier_counts_lock:
+        _tier_counts[rarity] = (count, now)
+    return count
+
+def get_person_at(rarity: str, index: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the index-th person (0-based, ordered by ID) of a rarity tier.
+    
+    Returns:
+        dict or None: The person record, or None if there is no such record
+    
+    Raises:
+        requests.exceptions.RequestException: On network errors or non-200 responses
+    """
+    page = fetch_records_page(COLLECTION_NAME, index + 1, per_page=1,
+                              filter_param=f'rarity="{rarity}"', sort="id")
+    items = page.get("items", [])
+    return items[0] if items else None
+
+def get_random_person_from_server(rarity: str, rng: Any = random) -> Optional[Dict[str, Any]]:
+    """
+    Pick a random person of a rarity on the server side.
+    
+    Only the tier count (usually cached) and the one chosen record are
+    transferred, so the cost per draw does not grow with the tier size.
+    Per-person weights are not applied in this mode.
+    
+    Returns:
+        dict or None: A person record, or None if the tier is empty or PocketBase is unreachable
+    """
+    for refresh in (False, True):
+        count = get_tier_count(rarity, refresh=refresh)
+        if not count:
+            return None
+        
+        index = rng.randrange(count)
+        try:
+            person = get_person_at(rarity, index)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching person with rarity {rarity}: {e}")
+            return None
+        if person is not None:
+            print(f"Picked #{index + 1} of {count} people with rarity {rarity}")
+            return person
+        # The tier shrank since it was counted - count again and retry once
+    return None
+
+def get_all_people(concurrent: bool = True) -> Optional[list]:
+    """
+    Fetch the whole people collection from PocketBase.
+    
+    Args:
+        concurrent (bool): Fetch pages in parallel once the total is known
+    
+    Returns:
+        list or None: All person records, or None if the request failed
+    """
+    try:
+        return list(iter_records(COLLECTION_NAME, concurrent=concurrent))
+            
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching roster: {e}")
+        return None
+
+class RosterCache:
+    """
+    Process-wide in-memory copy of the people collection, grouped by rarity.
+    
+    The roster is loaded once and served from memory until it is older than
+    the TTL or explicitly refreshed. If a reload fails, the previous roster
+    keeps being served so draws continue while PocketBase is unreachable.
+    
+    Every successful load is also written to an on-disk replica. When the
+    cache is empty (e.g. right after startup) the replica is read first, so
+    draws are available immediately and keep working with PocketBase offline;
+    the fresh roster is then fetched in the background.
+    """
+    
+    def __init__(self, ttl: float = ROSTER_CACHE_TTL, retry_interval: float = ROSTER_RETRY_INTERVAL,
+                 replica: Optional[RosterReplica] = None):
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.replica = replica
+        self._buckets: Dict[str, list] = {}
+        self._samplers: Dict[str, Optional[AliasSampler]] = {}
+        self._loaded_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._fetch_started: Optional[float] = None  # When the fetch of the current roster began
+        self._generation = 0  # Bumped by invalidate() so in-flight fetches don't count as fresh
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+    
+    @property
+    def loaded(self) -> bool:
+        """True if a roster is available, from PocketBase or the replica."""
+        return bool(self._buckets)
+    
+    def is_stale(self) -> bool:
+        """Check whether the roster should be (re)loaded from PocketBase."""
+        now = time.monotonic()
+        if self._last_attempt is not None and now - self._last_attempt < self.retry_interval:
+            # A load was attempted recently - don't hammer PocketBase
+            return False
+        return self._loaded_at is None or now - self._loaded_at >= self.ttl
+    
+    def refresh(self) -> bool:
+        """
+        Reload the roster from PocketBase and update the replica.
+        
+        Returns:
+            bool: True if the roster was loaded, False if the load failed
+        """
+        with self._lock:
+            self._last_attempt = started = time.monotonic()
+            generation = self._generation
+        
+        # Fetch without holding the lock, so invalidate() and the replica never wait on the network
+        people = get_all_people()
+        if people is None:
+            return False
+        
+        with self._lock:
+            if self._fetch_started is not None and started < self._fetch_started:
+                # A refresh that started later has already installed a newer roster
+                return True
+            self._set_roster(people)
+            self._fetch_started = started
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+            print(f"Roster cache loaded: {len(people)} people")
+        
+        if self.replica is not None:
+            try:
+                self.replica.save(people)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not update roster replica: {e}")
+        return True
+    
+    def refresh_async(self) -> None:
+        """Reload the roster in a background thread (no-op if one is already running)."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+        self._refresh_thread.start()
+    
+    def load_replica(self) -> bool:
+        """
+        Fill the cache from the on-disk replica.
+        
+        Returns:
+            bool: True if the replica contained a roster
+        """
+        if self.replica is None:
+            return False
+        try:
+            people = self.replica.load()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read roster replica: {e}")
+            return False
+        if not people:
+            return False
+        
+        with self._lock:
+            # Never replace a roster that was already loaded from PocketBase
+            if not self._buckets:
+                self._set_roster(people)
+                print(f"Roster cache loaded from replica: {len(people)} people")
+        return True
+    
+    def warm(self) -> None:
+        """Load the replica now and fetch the current roster in the background."""
+        self.load_replica()
+        self.refresh_async()
+    
+    def invalidate(self) -> None:
+        """Mark the roster as stale so the next draw reloads it."""
+        with self._lock:
+            self._loaded_at = None
+            self._last_attempt = None
+            self._generation += 1
+    
+    def get_people(self, rarity: str) -> list:
+        """Get all cached people with the given rarity, loading the roster if needed."""
+        if not self._buckets:
+            # Nothing in memory yet: use the replica, or wait for PocketBase if there is none
+            if not self.load_replica() and self.is_stale():
+                self.refresh()
+        elif self.is_stale():
+            # Keep serving the current roster while the new one loads
+            self.refresh_async()
+        return self._buckets.get(rarity, [])
+    
+    def get_sampler(self, rarity: str) -> Optional[AliasSampler]:
+        """Get the per-person sampler for a tier, or None if its people are equally weighted."""
+        return self._samplers.get(rarity)
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of cached people per rarity."""
+        return {rarity: len(people) for rarity, people in self._buckets.items()}
+    
+    def _set_roster(self, people: list) -> None:
+        buckets: Dict[str, list] = {rarity: [] for rarity in RARITY_WEIGHTS}
+        # Sorted by ID so a replayed draw picks the same person whatever order the roster arrived in
+        for person in sorted(people, key=lambda person: person.get("id", "")):
+            buckets.setdefault(person.get("rarity", ""), []).append(person)
+        
+        # Samplers are only rebuilt here, when the roster (and so the weights) changes
+        samplers = {rarity: build_person_sampler(people) for rarity, people in buckets.items()}
+        
+        # Swap in the new roster in one step so readers never see a partial load
+        self._samplers = samplers
+        self._buckets = buckets
+
+# Shared roster cache for the whole process, backed by the on-disk replica
+_roster_cache = RosterCache(replica=RosterReplica())
+
+def get_roster_cache() -> RosterCache:
+    """Get the process-wide roster cache."""
+    return _roster_cache
+
+def refresh_roster_cache() -> bool:
+    """Force a reload of the process-wide roster cache."""
+    return _roster_cache.refresh()
+
+# Random engine for this session, created on the first draw
+_rng_engine: Optional[RandomEngine] = None
+
+def get_rng_engine() -> RandomEngine:
+    """Get the session's random engine, creating one with a random seed if needed."""
+    global _rng_engine
+    if _rng_engine is None:
+        set_rng_engine(RandomEngine())
+    return _rng_engine
+
+def set_rng_engine(engine: RandomEngine) -> None:
+    """Use `engine` for all following draws and log its seed."""
+    global _rng_engine
+    _rng_engine = engine
+    print(f"Draw RNG seed: {engine.seed} (stream {engine.stream_id})")
+
+def split_draw_id(draw_id: str) -> tuple:
+    """
+    Split a logged draw ID into the RNG part and the pity counter.
+    
+    Draws made with a pity counter are logged as "seed:stream:counter@since_pity",
+    since the counter changes the rarity weights.
+    
+    Returns:
+        tuple: (RNG draw ID, draws since last S/A or None)
+    
+    Raises:
+        ValueError: If the pity part is not a number
+    """
+    rng_id, _, since_pity = draw_id.partition("@")
+    return rng_id, int(since_pity) if since_pity else None
+
+def get_random_person(use_cache: bool = True, draw_id: Optional[str] = None,
+                      pity: Optional[PityTracker] = None) -> Optional[Dict[str, Any]]:
     """
     Get a random person from the database based on weighted rarity selection.
     
+    The in-memory roster cache (or its on-disk replica) is used when it has a
+    roster. Otherwise the person is picked on the server side, fetching only
+    one record, while the roster loads in the background for later draws.
+    
+    Args:
+        use_cache (bool): Draw from the roster cache when available; False
+            always picks on the server side
+        draw_id (str, optional): Replay a logged draw instead of making a new one
+            (gives the same person as long as the roster has not changed);
+            the pity counter is not used or updated when replaying
+        pity (PityTracker, optional): Apply and update this booth's pity counter
+    
     Returns:
         dict or None: A person record as a dictionary, or None if no person found
     """
-    # First, select a rarity based on weights
-    selected_rarity = get_weighted_rarity()
-    print(f"Selected rarity: {selected_rarity}")
+    replay_pity = None
+    if draw_id is None:
+        draw_id, rng = get_rng_engine().next_draw()
+    else:
+        draw_id, replay_pity = split_draw_id(draw_id)
+        rng = RandomEngine.replay(draw_id)
+        pity = None
     
-    # Get all people with that rarity
-    people_with_rarity = get_people_by_rarity(selected_rarity)
+    # First, select a rarity based on weights (raised towards S/A by the pity counter)
+    if pity is not None:
+        rarity_sampler = pity.sampler(RARITY_WEIGHTS)
+        print(f"Draw {draw_id}@{pity.since_pity}")
+        selected_rarity = rarity_sampler.sample(rng)
+    elif replay_pity is not None:
+        print(f"Draw {draw_id}@{replay_pity} (replay)")
+        selected_rarity = AliasSampler.from_dict(pity_weights(RARITY_WEIGHTS, replay_pity)).sample(rng)
+    else:
+        print(f"Draw {draw_id}")
+        selected_rarity = get_weighted_rarity(rng)
+    print(f"Selected rarity: {selected_rarity}")
     
-    if not people_with_rarity:
-        print(f"No people found with rarity {selected_rarity}")
-        return None
+    if use_cache and (_roster_cache.loaded or _roster_cache.load_replica()):
+        people_with_rarity = _roster_cache.get_people(selected_rarity)
+        if not people_with_rarity:
+            print(f"No people found with rarity {selected_rarity}")
+            return None
+        
+        # Randomly select one person from the tier, honouring per-person weights if set
+        sampler = _roster_cache.get_sampler(selected_rarity)
+        if sampler is not None:
+            selected_person = sampler.sample(rng)
+        else:
+            selected_person = rng.choice(people_with_rarity)
+        print(f"Found {len(people_with_rarity)} people with rarity {selected_rarity}")
+    else:
+        if use_cache:
+            # Load the full roster for the next draws without making this one wait
+            _roster_cache.refresh_async()
+        selected_person = get_random_person_from_server(selected_rarity, rng)
+        if selected_person is None:
+            print(f"No people found with rarity {selected_rarity}")
+            return None
     
-    # Randomly select one person from the list
-    selected_person = random.choice(people_with_rarity)
+    if pity is not None:
+        pity.record(selected_rarity)
     
-    print(f"Found {len(people_with_rarity)} people with rarity {selected_rarity}")
     print(f"Selected: {selected_person.get('name', 'Unknown')}")
     
     return selected_person
 
+def pick_from_tier(people: list, count: int, sampler: Optional[AliasSampler] = None,
+                   unique: bool = True, rng: Any = random) -> list:
+    """
+    Pick `count` people from one rarity tier.
+    
+    Args:
+        people (list): The tier, in a stable order
+        count (int): Number of people to pick
+        sampler (AliasSampler, optional): Per-person weights for the tier
+        unique (bool): Avoid picking the same person twice; if the tier has
+            fewer people than `count`, the rest are repeats
+        rng: Random source (the random module or a random.Random instance)
+    """
+    if not people or count <= 0:
+        return []
+    if not unique:
+        if sampler is not None:
+            return [sampler.sample(rng) for _ in range(count)]
+        return [rng.choice(people) for _ in range(count)]
+    
+    distinct = min(count, len(people))
+    if sampler is None:
+        picked = rng.sample(people, distinct)
+    else:
+        # Weighted without replacement: redraw duplicates, but never loop for long
+        picked, seen = [], set()
+        for _ in range(distinct * 20):
+            person = sampler.sample(rng)
+            if person.get("id") not in seen:
+                seen.add(person.get("id"))
+                picked.append(person)
+                if len(picked) == distinct:
+                    break
+        remaining = [person for person in people if person.get("id") not in seen]
+        picked += rng.sample(remaining, distinct - len(picked))
+    
+    if distinct < count:
+        print(f"Only {len(people)} people with rarity {people[0].get('rarity')} - pack has repeats")
+        picked += [rng.choice(people) for _ in range(count - distinct)]
+    return picked
+
+def get_random_people(k: int, unique: bool = True, use_cache: bool = True,
+                      draw_id: Optional[str] = None,
+                      pity: Optional[PityTracker] = None) -> List[Dict[str, Any]]:
+    """
+    Draw k people at once, e.g. for a booster pack.
+    
+    All rarities are rolled in one vectorised pass (one at a time when a pity
+    counter is used, since every card can change the weights) and the cards
+    are then picked per tier. Each tier is read at most once: from the roster
+    cache, or with one roster load if nothing is cached yet.
+    
+    Args:
+        k (int): Number of people to draw
+        unique (bool): No person appears twice in the pack (unless a tier is too small)
+        use_cache (bool): Draw from the roster cache; False fetches each
+            needed tier from PocketBase once
+        draw_id (str, optional): Replay a logged pack draw; the pity counter
+            is not used or updated when replaying
+        pity (PityTracker, optional): Apply and update this booth's pity counter;
+            only cards that end up in the pack are recorded
+    
+    Returns:
+        list: The drawn person records, in draw order (empty if nothing could be drawn)
+    
+    Raises:
+        ValueError: If k is negative
+    """
+    if k < 0:
+        raise ValueError(f"Number of people to draw must not be negative, got {k}")
+    
+    since_pity = None
+    if draw_id is None:
+        draw_id, rng = get_rng_engine().next_draw()
+        if pity is not None:
+            pity.load()
+            since_pity = pity.since_pity
+    else:
+        draw_id, since_pity = split_draw_id(draw_id)
+        rng = RandomEngine.replay(draw_id)
+        pity = None
+    
+    # Roll every card's rarity
+    if since_pity is not None:
+        print(f"Pack draw {draw_id}@{since_pity} ({k} cards)")
+        # Count locally so the rolls depend only on the logged starting counter
+        samplers: Dict[int, AliasSampler] = {}
+        rarities = []
+        for _ in range(k):
+            steps = min(since_pity, PITY_THRESHOLD)
+            if steps not in samplers:
+                samplers[steps] = AliasSampler.from_dict(pity_weights(RARITY_WEIGHTS, steps))
+            rarity = samplers[steps].sample(rng)
+            since_pity = 0 if rarity in PITY_RARITIES else since_pity + 1
+            rarities.append(rarity)
+    else:
+        print(f"Pack draw {draw_id} ({k} cards)")
+        rarities = get_rarity_sampler().draw(k, np.random.default_rng(rng.getrandbits(64)))
+    
+    # Group the cards by tier and read each tier once
+    needed = Counter(rarities)
+    if use_cache:
+        if not (_roster_cache.loaded or _roster_cache.load_replica()):
+            _roster_cache.refresh()
+        tiers = {rarity: (_roster_cache.get_people(rarity), _roster_cache.get_sampler(rarity))
+                 for rarity in needed}
+    else:
+        tiers = {}
+        for rarity in needed:
+            people = sorted(get_people_by_rarity(rarity), key=lambda person: person.get("id", ""))
+            tiers[rarity] = (people, build_person_sampler(people))
+    
+    picks = {}
+    for rarity in sorted(needed):
+        people, sampler = tiers[rarity]
+        picks[rarity] = iter(pick_from_tier(people, needed[rarity], sampler, unique, rng))
+    
+    pack = []
+    for rarity in rarities:
+        person = next(picks[rarity], None)
+        if person is None:
+            print(f"No people found with rarity {rarity}")
+            continue
+        pack.append(person)
+        if pity is not None:
+            pity.record(rarity)
+        print(f"  {rarity}: {person.get('name', 'Unknown')}")
+    return pack
+
 def check_pocketbase_connection() -> bool:
     """Check if PocketBase is running and accessible."""
-    try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
-        return response.status_code == 200
-    except requests.exceptions.RequestException:
-        return False
+    return get_client().health(timeout=5)
 
 def display_person_info(person: Dict[str, Any]) -> None:
     """Display formatted person information."""
@@ -111,19 +608,38 @@ def display_person_info(person: Dict[str, Any]) -> None:
     print(f"ID: {person.get('id', 'Unknown')}")
     print("=" * 50)
 
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Draw random people from PocketBase')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for reproducible draws (default: random, logged at startup)')
+    parser.add_argument('--replay', metavar='DRAW_ID', default=None,
+                       help='Replay a logged draw, e.g. --replay 81234:0:17 or 81234:0:17@36 '
+                            '(draw made with 36 draws since the last S/A)')
+    return parser.parse_args()
+
 def main():
     """Main function for testing the random person selection."""
+    args = parse_arguments()
+    
     print("Random Person Selector")
     print("-" * 30)
     
+    if args.seed is not None:
+        set_rng_engine(RandomEngine(args.seed))
+    
     # Check PocketBase connection
     if not check_pocketbase_connection():
-        print("❌ Cannot connect to PocketBase at http://localhost:8090")
+        print(f"❌ Cannot connect to PocketBase at {POCKETBASE_URL}")
         print("Make sure PocketBase is running.")
         return
     
     print("✅ Connected to PocketBase")
     
+    if args.replay:
+        display_person_info(get_random_person(draw_id=args.replay))
+        return
+    
     # Display rarity weights for reference
     print("\nRarity Distribution:")
     total_weight = sum(RARITY_WEIGHTS.values())
@@ -160,6 +676,7 @@ def main():
     for rarity, count in rarity_counts.items():
         percentage = (count / num_tests) * 100
         print(f"  {rarity}: {count} ({percentage:.1f}%)")
+    print("Run simulate_rarity.py for a statistical check of the rates.")
 
 if __name__ == "__main__":
     main()
@@ -12,31 +12,43 @@ Usage:
 Arguments:
     --text-width: Controls text size - smaller values create smaller text (default: 24)
     --image-width: Width for processed images in pixels (default: 256)
+    --archive-dir: Folder to save full-resolution photos to in the background (default: off)
 """
 
 import tkinter as tk
 from tkinter import messagebox, ttk
-import requests
 from datetime import datetime
 import threading
 import argparse
+import socket
 import sys
 import re
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
 
 # Import functions from other modules
-from getRandomPerson import get_random_person, check_pocketbase_connection
+from getRandomPerson import (RARITY_WEIGHTS, get_random_person, get_random_people,
+                             check_pocketbase_connection, get_roster_cache, set_rng_engine)
+from pity import DrawStateStore, PityTracker
+from rng_engine import RandomEngine
+from receipt_compiler import compile_receipt, compile_pack_receipt, DEFAULT_CODE_PAGE
+from connection_monitor import ConnectionMonitor
+from receipt_journal import ReceiptJournal
 
 # Try to import camera and printer modules (may not be available on all systems)
 try:
     from test_camera import take_and_process_photo
+    from camera_service import get_camera_service, archive_capture_async, PreviewProducer
     CAMERA_AVAILABLE = True
 except ImportError as e:
     print(f"Camera module not available: {e}")
     CAMERA_AVAILABLE = False
 
 try:
-    from escpos.printer import Usb
+    from printer_manager import PrinterManager
+    from print_spooler import PrintSpooler, DONE, FAILED, RETRYING, WAITING
     PRINTER_AVAILABLE = True
 except ImportError as e:
     print(f"Printer module not available: {e}")
@@ -50,57 +62,30 @@ except ImportError as e:
     PIL_AVAILABLE = False
 
 # --- Configuration ---
-POCKETBASE_URL = "http://localhost:8090"
-API_URL = f"{POCKETBASE_URL}/api"
 RECEIPTS_COLLECTION = "receipts"
 
 # Printer configuration
 PRINTER_VENDOR_ID = 0x0fe6
 PRINTER_PRODUCT_ID = 0x811e
 
+# Simulated prints are saved here, byte-identical to what the printer would receive
+SIMULATED_RECEIPT_FILE = "simulated_receipt.bin"
+
 # Default settings (can be overridden by command line arguments)
 DEFAULT_TEXT_WIDTH = 24  # Controls text size - smaller values = smaller text
 DEFAULT_IMAGE_WIDTH = 256  # Smaller default image size
+DEFAULT_PACK_SIZE = 5  # Cards per booster pack
 
-# Norwegian character mapping to UTF-8 byte sequences
-NORWEGIAN_CHAR_MAP = {
-    'ø': '\xF8',  # UTF-8 byte for ø
-    'Ø': '\xD8',  # UTF-8 byte for Ø
-    'å': '\xE5',  # UTF-8 byte for å
-    'Å': '\xC5',  # UTF-8 byte for Å
-    'æ': '\xE6',  # UTF-8 byte for æ
-    'Æ': '\xC6',  # UTF-8 byte for Æ
-}
-
-def replace_norwegian_chars(text):
-    """Replace Norwegian characters with their UTF-8 byte representations for thermal printer."""
-    for norwegian_char, utf8_byte in NORWEGIAN_CHAR_MAP.items():
-        text = text.replace(norwegian_char, utf8_byte)
-    return text
+# Camera preview settings (frames come from a small dedicated stream, captured off the UI thread)
+PREVIEW_INTERVAL_MS = 33  # How often the UI checks for a new preview frame
+PREVIEW_DISPLAY_SIZE = (400, 300)  # Maximum size of the preview image
 
-def setup_printer_encoding(printer):
-    """
-    Configure printer for Norwegian/Danish characters.
-    Returns True if successful, False otherwise.
-    """
-    try:
-        # Try CP865 first (Norwegian/Danish)
-        printer.charcode('CP865')
-        return True
-    except:
-        try:
-            # Fallback to CP850 (Western European)
-            printer.charcode('CP850')
-            return True
-        except:
-            try:
-                # Final fallback to CP437 (Original IBM PC)
-                printer.charcode('CP437')
-                return True
-            except:
-                # If all encoding attempts fail, continue without encoding
-                print("Warning: Could not set printer encoding for special characters")
-                return False
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -109,13 +94,62 @@ def parse_arguments():
                        help=f'Text size control - smaller values = smaller text (default: {DEFAULT_TEXT_WIDTH})')
     parser.add_argument('--image-width', type=int, default=DEFAULT_IMAGE_WIDTH,
                        help=f'Width for processed images (default: {DEFAULT_IMAGE_WIDTH})')
+    parser.add_argument('--archive-dir', default=None,
+                       help='Save a full-resolution JPEG of every photo to this folder (default: off)')
+    parser.add_argument('--pack-size', type=positive_int, default=DEFAULT_PACK_SIZE,
+                       help=f'Cards per booster pack (default: {DEFAULT_PACK_SIZE})')
+    parser.add_argument('--booth', default=socket.gethostname(),
+                       help='Booth name the pity counter is kept for (default: this computer\'s hostname)')
+    parser.add_argument('--requeue-failed', action='store_true',
+                       help='Print the receipts in spool/failed/ again on startup')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for reproducible draws (default: random, logged at startup)')
     return parser.parse_args()
 
+class StageTimer:
+    """Records how long each receipt stage takes. Safe to use from several threads."""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def total(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self.started
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time the body of a with-block as the given stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.durations[name] = time.perf_counter() - start
+    
+    def run(self, name: str, func, *args):
+        """Call func(*args) and time it as the given stage."""
+        with self.stage(name):
+            return func(*args)
+    
+    def summary(self) -> str:
+        """One line with every stage's duration and the end-to-end time."""
+        with self._lock:
+            parts = [f"{name} {seconds:.2f}s" for name, seconds in self.durations.items()]
+        parts.append(f"total {self.total:.2f}s")
+        return " | ".join(parts)
+
 class TCGApp:
-    def __init__(self, root, text_width=DEFAULT_TEXT_WIDTH, image_width=DEFAULT_IMAGE_WIDTH):
+    def __init__(self, root, text_width=DEFAULT_TEXT_WIDTH, image_width=DEFAULT_IMAGE_WIDTH,
+                 archive_dir=None, booth=None, pack_size=DEFAULT_PACK_SIZE,
+                 requeue_failed=False):
         self.root = root
         self.text_width = text_width
         self.image_width = image_width
+        self.archive_dir = archive_dir
+        self.pack_size = pack_size
         
         self.root.title("TCG Receipt Generator")
         # Get screen dimensions
@@ -143,8 +177,83 @@ class TCGApp:
         # Add escape key binding to exit fullscreen mode
         self.root.bind('<Escape>', self.toggle_fullscreen)
         
-        # Check initial connections
-        self.check_connections()
+        # Workers for receipt stages that run alongside the camera and printer
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="receipt-stage")
+        
+        # Start the camera once so it is warm when the first receipt is generated
+        self.camera = None
+        if CAMERA_AVAILABLE:
+            self.camera = get_camera_service()
+            self.camera.start_async()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Open the printer once and keep it open between receipts
+        self.printer_manager = None
+        self.print_spooler = None
+        if PRINTER_AVAILABLE:
+            self.printer_manager = PrinterManager(PRINTER_VENDOR_ID, PRINTER_PRODUCT_ID)
+            threading.Thread(target=self.connect_printer, daemon=True).start()
+            
+            # Receipts are printed by a background worker so the next customer doesn't wait
+            self.print_spooler = PrintSpooler(self.printer_manager.print_bytes,
+                                              on_status=self.on_print_status,
+                                              connect=self.printer_manager.connect)
+            if requeue_failed:
+                self.print_spooler.requeue_failed()
+            self.print_spooler.start()
+        
+        # Receipt records are journaled locally and delivered to PocketBase in the background
+        self.receipt_journal = ReceiptJournal(RECEIPTS_COLLECTION)
+        self.receipt_journal.start()
+        
+        # Load the roster from the local replica now and refresh it from PocketBase in the background
+        get_roster_cache().warm()
+        
+        # Pity counter for this booth, restored in the background before the first draw
+        self.booth = booth or socket.gethostname()
+        self.pity = PityTracker(self.booth, DrawStateStore())
+        self.executor.submit(self.pity.load)
+        
+        # Watch the database connection in the background instead of checking it per receipt
+        self.connection_monitor = ConnectionMonitor(check_pocketbase_connection,
+                                                    on_change=self.on_connection_change)
+        self.connection_monitor.start()
+    
+    def on_close(self):
+        """Release the camera and close the application."""
+        if self.camera is not None:
+            self.camera.stop()
+        self.executor.shutdown(wait=False)
+        self.connection_monitor.stop()
+        self.receipt_journal.stop()
+        if self.print_spooler is not None:
+            self.print_spooler.stop()
+        if self.printer_manager is not None:
+            self.printer_manager.disconnect()
+        self.root.destroy()
+    
+    def connect_printer(self):
+        """Open the printer in the background and show the result."""
+        if self.printer_manager.connect():
+            text, color = "Printer: Connected ✓", "green"
+        else:
+            text, color = "Printer: Disconnected ✗", "red"
+        self.root.after(0, lambda: self.printer_status_label.config(text=text, foreground=color))
+    
+    def on_print_status(self, job_id, status, message):
+        """Show print job progress (called from the spooler's worker thread)."""
+        pending = self.print_spooler.pending
+        if status == DONE:
+            text, color = f"Printer: Last receipt printed ✓ ({pending} queued)", "green"
+        elif status == FAILED:
+            text, color = f"Printer: Job {job_id} failed ✗ - {message}", "red"
+        elif status == WAITING:
+            text, color = f"Printer: Disconnected ✗ - {pending + 1} receipt(s) waiting", "red"
+        elif status == RETRYING:
+            text, color = f"Printer: Retrying job {job_id} - {message}", "orange"
+        else:
+            text, color = f"Printer: Job {job_id} {status} ({pending} queued)", "blue"
+        self.root.after(0, lambda: self.printer_status_label.config(text=text, foreground=color))
     
     def toggle_fullscreen(self, event=None):
         """Toggle between fullscreen and windowed mode."""
@@ -197,10 +306,16 @@ class TCGApp:
         self.generate_button.grid(row=0, column=0, padx=(0, 10), 
                                 ipadx=20, ipady=10)
         
+        # Booster pack button
+        self.pack_button = ttk.Button(buttons_frame, text=f"Open Pack ({self.pack_size})",
+                                    command=self.open_pack_threaded)
+        self.pack_button.grid(row=0, column=1, padx=(0, 10),
+                            ipadx=10, ipady=10)
+        
         # Test button
         self.test_button = ttk.Button(buttons_frame, text="Test", 
                                     command=self.test_receipt_threaded)
-        self.test_button.grid(row=0, column=1, 
+        self.test_button.grid(row=0, column=2, 
                             ipadx=10, ipady=5)
         
         # Progress bar
@@ -218,15 +333,16 @@ class TCGApp:
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
     
-    def check_connections(self):
-        """Check database and printer connections."""
-        # Check database
-        if check_pocketbase_connection():
-            self.db_status_label.config(text="Database: Connected ✓", 
-                                      foreground="green")
+    def on_connection_change(self, connected):
+        """Update the database status label (called from the connection monitor thread)."""
+        if connected:
+            text, color = "Database: Connected ✓", "green"
         else:
-            self.db_status_label.config(text="Database: Disconnected ✗", 
-                                      foreground="red")
+            text, color = "Database: Disconnected ✗", "red"
+        self.root.after(0, lambda: self.db_status_label.config(text=text, foreground=color))
+        if connected:
+            # Deliver receipts saved while the database was down
+            self.receipt_journal.flush_now()
     
     def update_status(self, message, color="black"):
         """Update the status label."""
@@ -236,6 +352,7 @@ class TCGApp:
     def generate_receipt_threaded(self):
         """Run the receipt generation in a separate thread to prevent UI freezing."""
         self.generate_button.config(state="disabled")
+        self.pack_button.config(state="disabled")
         self.test_button.config(state="disabled")
         self.progress.start()
         
@@ -246,6 +363,7 @@ class TCGApp:
     def test_receipt_threaded(self):
         """Run the test receipt generation in a separate thread to prevent UI freezing."""
         self.generate_button.config(state="disabled")
+        self.pack_button.config(state="disabled")
         self.test_button.config(state="disabled")
         self.progress.start()
         
@@ -253,58 +371,123 @@ class TCGApp:
         thread.daemon = True
         thread.start()
     
-    def generate_receipt(self, testing=False):
-        """Main function to generate a receipt with photo and person data."""
+    def open_pack_threaded(self):
+        """Run the booster pack generation in a separate thread to prevent UI freezing."""
+        self.generate_button.config(state="disabled")
+        self.pack_button.config(state="disabled")
+        self.test_button.config(state="disabled")
+        self.progress.start()
+        
+        thread = threading.Thread(target=self.generate_receipt, args=(False, self.pack_size))
+        thread.daemon = True
+        thread.start()
+    
+    def draw_person(self, testing=False):
+        """
+        Draw a random person. Works offline from the local roster replica.
+        Test draws leave the pity counter alone, since they create no receipt record.
+        """
+        if self.connection_monitor.connected is False:
+            # Re-check right away so the status recovers as soon as PocketBase is back
+            self.connection_monitor.probe_now()
+            print("PocketBase is offline, drawing from the local roster")
+        
+        person = get_random_person(pity=None if testing else self.pity)
+        if not person:
+            raise Exception("Could not retrieve a random person from database.")
+        return person
+    
+    def draw_pack(self, size, testing=False):
+        """Draw a booster pack of `size` different people in one go."""
+        if self.connection_monitor.connected is False:
+            self.connection_monitor.probe_now()
+            print("PocketBase is offline, drawing from the local roster")
+        
+        cards = get_random_people(size, unique=True, pity=None if testing else self.pity)
+        if not cards:
+            raise Exception("Could not retrieve random people from database.")
+        return cards
+    
+    def generate_receipt(self, testing=False, pack_size=0):
+        """
+        Main function to generate a receipt with photo and person data.
+        With a pack size, a booster pack of that many cards is printed on one receipt.
+        
+        Independent stages overlap: the person is drawn while the photo is
+        taken, and the receipt record is saved while the receipt is printed.
+        """
+        timer = StageTimer()
         try:
-            # Step 1: Check database connection
-            self.update_status("Checking database connection...", "blue")
-            if not check_pocketbase_connection():
-                raise Exception("Cannot connect to PocketBase. Make sure it's running.")
-            
-            # Step 2: Get random person
-            self.update_status("Selecting random person...", "blue")
-            person = get_random_person()
-            if not person:
-                raise Exception("Could not retrieve a random person from database.")
+            # Step 1: Draw a random person (or a whole pack) in the background
+            if pack_size:
+                self.update_status("Opening booster pack and taking photo...", "blue")
+                person_future = self.executor.submit(timer.run, "draw", self.draw_pack, pack_size, testing)
+            else:
+                self.update_status("Selecting random person and taking photo...", "blue")
+                person_future = self.executor.submit(timer.run, "draw", self.draw_person, testing)
             
-            # Step 3: Take and process photo
-            self.update_status("Taking photo...", "blue")
+            # Step 2: Take and process photo while the draw runs
             processed_image = None
-            if CAMERA_AVAILABLE:
-                try:
-                    processed_image = self.take_and_process_photo_custom()
-                    if not processed_image:
-                        print("Failed to capture and process photo.")
-                except Exception as e:
-                    # If camera fails, we'll continue without photo
-                    print(f"Camera error: {e}")
-                    processed_image = None
-                    self.update_status("Photo capture failed, continuing without photo...", "orange")
+            with timer.stage("photo"):
+                if CAMERA_AVAILABLE:
+                    try:
+                        processed_image = self.take_and_process_photo_custom()
+                        if not processed_image:
+                            print("Failed to capture and process photo.")
+                    except Exception as e:
+                        # If camera fails, we'll continue without photo
+                        print(f"Camera error: {e}")
+                        processed_image = None
+                        self.update_status("Photo capture failed, continuing without photo...", "orange")
+                else:
+                    print("Camera not available on this system.")
+                    self.update_status("Camera not available, continuing without photo...", "orange")
+            
+            if pack_size:
+                cards = person_future.result()
+                # The rarest card stands for the pack in the status messages
+                person = min(cards, key=lambda card: RARITY_WEIGHTS.get(card.get('rarity'), float('inf')))
             else:
-                print("Camera not available on this system.")
-                self.update_status("Camera not available, continuing without photo...", "orange")
+                person = person_future.result()
+                cards = [person]
+            
+            # Step 3: Save the receipt record(s) in the background (skip if testing)
+            save_future = None
+            if not testing:
+                save_future = self.executor.submit(timer.run, "save", self.create_receipt_records, cards)
             
-            # Step 4: Print receipt
-            print_status = "Printing test receipt..." if testing else "Printing receipt..."
+            # Step 4: Print receipt while the record is being saved
+            print_status = "Queueing test receipt..." if testing else "Queueing receipt..."
             self.update_status(print_status, "blue")
-            self.print_receipt(person, processed_image)
+            if pack_size:
+                timer.run("print", self.print_pack_receipt, cards, processed_image)
+            else:
+                timer.run("print", self.print_receipt, person, processed_image)
             
-            # Step 5: Create receipt record in database (skip if testing)
+            # Step 5: Wait for the receipt record
             if testing:
                 self.update_status("Test mode - skipping database save", "orange")
             else:
                 self.update_status("Saving receipt record...", "blue")
-                self.create_receipt_record(person)
+                save_future.result()
+            
+            print(f"Stage timings: {timer.summary()}")
             
             # Success
             if testing:
-                self.update_status("Test receipt generated successfully! ✓", "green")
+                self.update_status(f"Test receipt generated successfully! ✓ ({timer.total:.1f}s)", "green")
                 messagebox.showinfo("Test Success", 
                                   f"Test receipt generated for {person.get('name', 'Unknown')} "
                                   f"({person.get('rarity', 'Unknown')} rarity)\n\n"
                                   f"Note: No database entry was created.")
+            elif pack_size:
+                self.update_status(f"Booster pack generated successfully! ✓ ({timer.total:.1f}s)", "green")
+                messagebox.showinfo("Success",
+                                  f"Booster pack with {len(cards)} cards generated\n\n"
+                                  f"Best card: {person.get('name', 'Unknown')} "
+                                  f"({person.get('rarity', 'Unknown')} rarity)")
             else:
-                self.update_status("Receipt generated successfully! ✓", "green")
+                self.update_status(f"Receipt generated successfully! ✓ ({timer.total:.1f}s)", "green")
                 messagebox.showinfo("Success", 
                                   f"Receipt generated for {person.get('name', 'Unknown')} "
                                   f"({person.get('rarity', 'Unknown')} rarity)")
@@ -320,97 +503,52 @@ class TCGApp:
             # Re-enable buttons and stop progress
             self.progress.stop()
             self.generate_button.config(state="normal")
+            self.pack_button.config(state="normal")
             self.test_button.config(state="normal")
     
     def print_receipt(self, person: Dict[str, Any], image: Optional[object] = None):
-        """Print the receipt to thermal printer."""
+        """
+        Queue the receipt for the thermal printer.
+        Returns the print job ID, or None if the output was simulated.
+        """
         if not PRINTER_AVAILABLE:
             print("Printer not available - simulating print output:")
             self.simulate_print_output(person, image)
             return
             
         try:
-            # Initialize printer
-            printer = Usb(PRINTER_VENDOR_ID, PRINTER_PRODUCT_ID, 0, 
-                         profile="simple", in_ep=0x82, out_ep=0x03)
-            printer.open()
-            
-            # Try to set encoding, but don't fail if it doesn't work
-            try:
-                encoding_success = setup_printer_encoding(printer)
-                if encoding_success:
-                    print("Printer encoding configured for Norwegian characters")
-            except Exception as encoding_error:
-                print(f"Encoding setup failed, using character replacement: {encoding_error}")
-            
-            # Print header
-            printer.set(align='center', bold=True, double_height=True, font='b')
-            printer.text("IKT RECEIPT\n")
-            printer.ln(1)
-            
-            # Print person info - replace Norwegian characters
-            printer.set(align='center', bold=True, double_height=False)
-            name_processed = replace_norwegian_chars(person.get('name', 'Unknown'))
-            printer.text(f"{name_processed}\n")
-            
-            printer.set(align='center', bold=False)
-            rarity_processed = replace_norwegian_chars(person.get('rarity', 'Unknown'))
-            printer.text(f"Rarity: {rarity_processed}\n")
-            printer.ln(1)
-            
-            # Print description with Norwegian character replacement
-            description = person.get('description', 'No description available')
-            description_processed = replace_norwegian_chars(description)
-            printer.set(align='left', bold=False)
-            printer.text(description_processed)
-            printer.ln(1)
-            
-            # Calculate height and width multipliers based on text_width setting
-            # Smaller text_width values will result in smaller text
-            # Default (24) = normal size (1x), smaller values = smaller text
-            # size_multiplier = max(1, self.text_width // 12)  # Scale down for smaller widths
-            # if self.text_width <= 12:
-            #     height_mult = 1
-            #     width_mult = 1
-            # elif self.text_width <= 18:
-            #     height_mult = 1
-            #     width_mult = 1
-            # elif self.text_width <= 24:
-            #     height_mult = 1
-            #     width_mult = 1
-            # else:
-            #     height_mult = min(2, self.text_width // 20)
-            #     width_mult = min(2, self.text_width // 20)
+            # Render the whole receipt up front and hand it to the spooler
+            receipt = compile_receipt(person, image if PIL_AVAILABLE else None,
+                                      self.printer_manager.code_page or DEFAULT_CODE_PAGE)
+            job_id = self.print_spooler.submit(receipt, person.get('name', 'Unknown'))
+            print(f"Receipt queued for printing as job {job_id} ({len(receipt)} bytes)")
+            return job_id
             
-            # printer.set(align='left', bold=False, height=height_mult, width=width_mult)
-            
-            # # Adjust wrapping width based on actual text size
-            # # Larger text takes more space, so we need fewer characters per line
-            # effective_width = self.text_width // max(1, (height_mult + width_mult) // 2)
-            # wrapped_description = self.wrap_text(description, effective_width)
-            # for line in wrapped_description:
-            #     printer.text(f"{line}\n")
-            # printer.ln(1)
-            
-            # Print date and time
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            printer.set(align='center', bold=False)
-            printer.text(f"Generated: {current_time}\n")
-            printer.ln(2)
-            
-            # Print image if available
-            if image and PIL_AVAILABLE:
-                printer.set(align='center')
-                printer.image(image)
-                printer.ln(2)
-            
-            # Print footer
-            # printer.set(align='center', bold=False)
-            # printer.text("Thank you!\n")
-            printer.ln(2)
-            
-            printer.close()
-            print("Receipt printed successfully!")
+        except Exception as e:
+            raise Exception(f"Printer error: {str(e)}")
+    
+    def print_pack_receipt(self, cards: List[Dict[str, Any]], image: Optional[object] = None):
+        """
+        Queue a booster pack receipt: all cards are compiled into one buffer
+        and printed as a single spooler job.
+        Returns the print job ID, or None if the output was simulated.
+        """
+        code_page = (self.printer_manager and self.printer_manager.code_page) or DEFAULT_CODE_PAGE
+        receipt = compile_pack_receipt(cards, image if PIL_AVAILABLE else None, code_page)
+        
+        if not PRINTER_AVAILABLE:
+            print("Printer not available - simulating print output:")
+            for number, card in enumerate(cards, start=1):
+                print(f"  {number}. [{card.get('rarity', '?')}] {card.get('name', 'Unknown')}")
+            with open(SIMULATED_RECEIPT_FILE, 'wb') as file:
+                file.write(receipt)
+            print(f"ESC/POS output ({len(receipt)} bytes) saved to {SIMULATED_RECEIPT_FILE}")
+            return
+        
+        try:
+            job_id = self.print_spooler.submit(receipt, f"Pack of {len(cards)}")
+            print(f"Pack receipt queued for printing as job {job_id} ({len(receipt)} bytes)")
+            return job_id
             
         except Exception as e:
             raise Exception(f"Printer error: {str(e)}")
@@ -461,6 +599,13 @@ class TCGApp:
         print("       Thank you!")
         print()
         print("="*40)
+        
+        # Save the exact bytes the printer would have received
+        code_page = (self.printer_manager and self.printer_manager.code_page) or DEFAULT_CODE_PAGE
+        receipt = compile_receipt(person, image if PIL_AVAILABLE else None, code_page)
+        with open(SIMULATED_RECEIPT_FILE, 'wb') as file:
+            file.write(receipt)
+        print(f"ESC/POS output ({len(receipt)} bytes) saved to {SIMULATED_RECEIPT_FILE}")
     
     def take_and_process_photo_custom(self):
         """
@@ -470,82 +615,53 @@ class TCGApp:
         if not CAMERA_AVAILABLE or not PIL_AVAILABLE:
             return None
             
-        import time
-        from picamera2 import Picamera2
-        import tkinter as tk
-        from tkinter import messagebox
-        from PIL import ImageTk
-        import numpy as np
-        
-        # The filename for the initial high-resolution capture.
-        CAPTURE_FILENAME = "capture.jpg"
-        
-        picam2 = None
         captured_image = None
         
-        try:
-            # 1. --- Initialize camera and show preview ---
-            print("Initializing camera...")
-            picam2 = Picamera2()
-            
-            # Create a configuration for a still capture
-            config = picam2.create_still_configuration()
-            picam2.configure(config)
-            
-            picam2.start()
-            print("Camera started, waiting for auto-adjustment...")
-            time.sleep(2)  # Let camera adjust to lighting conditions
-            
+        # 1. --- Borrow the warm camera and show preview ---
+        with self.camera.session() as picam2:
             # Show preview window
-            preview_result = self.show_camera_preview(picam2)
+            preview_result = self.show_camera_preview()
             
             if preview_result:
-                # User clicked "Take Photo"
+                # User clicked "Take Photo" - grab the frame straight into memory
                 print("Capturing photo...")
-                picam2.capture_file(CAPTURE_FILENAME)
-                print(f"Picture saved as {CAPTURE_FILENAME}")
-                captured_image = CAPTURE_FILENAME
+                captured_image = picam2.capture_image("main")
             else:
                 # User cancelled
                 print("Photo capture cancelled by user")
                 return None
-            
-        finally:
-            # Ensure proper cleanup of camera resources
-            if picam2 is not None:
-                try:
-                    picam2.stop()
-                    picam2.close()
-                    print("Camera properly closed")
-                except Exception as e:
-                    print(f"Warning: Error during camera cleanup: {e}")
+
+        # Optionally keep a full-resolution copy without delaying the receipt
+        if self.archive_dir:
+            archive_capture_async(captured_image, self.archive_dir)
 
         # 2. --- Process the captured image ---
-        if captured_image:
-            print(f"Processing image for thermal look (width: {self.image_width})...")
-            with Image.open(captured_image) as img:
-                # Resize the image to the configured width, maintaining aspect ratio
-                original_width, original_height = img.size
-                aspect_ratio = original_height / float(original_width)
-                new_height = int(self.image_width * aspect_ratio)
-                resized_img = img.resize((self.image_width, new_height))
+        return self.process_photo(captured_image)
+    
+    def process_photo(self, img):
+        """Resize, grayscale and dither a captured image for the thermal printer."""
+        print(f"Processing image for thermal look (width: {self.image_width})...")
+        # Resize the image to the configured width, maintaining aspect ratio
+        original_width, original_height = img.size
+        aspect_ratio = original_height / float(original_width)
+        new_height = int(self.image_width * aspect_ratio)
+        # reducing_gap shrinks the full-resolution frame in cheap integer steps first
+        resized_img = img.resize((self.image_width, new_height), reducing_gap=3.0)
 
-                # Convert to grayscale ('L' mode in Pillow)
-                grayscale_img = resized_img.convert('L')
+        # Convert to grayscale ('L' mode in Pillow)
+        grayscale_img = resized_img.convert('L')
 
-                # DITHERING: This is the most important step!
-                # It converts the grayscale image to pure black and white ('1' mode)
-                # using a pattern of dots to simulate shades of gray. This looks
-                # much better on a thermal printer than simple thresholding.
-                # Floyd-Steinberg is a popular and effective dithering algorithm.
-                dithered_img = grayscale_img.convert('1', dither=Image.Dither.FLOYDSTEINBERG)
-                
-                print("Image processing complete.")
-                return dithered_img
-        
-        return None
+        # DITHERING: This is the most important step!
+        # It converts the grayscale image to pure black and white ('1' mode)
+        # using a pattern of dots to simulate shades of gray. This looks
+        # much better on a thermal printer than simple thresholding.
+        # Floyd-Steinberg is a popular and effective dithering algorithm.
+        dithered_img = grayscale_img.convert('1', dither=Image.Dither.FLOYDSTEINBERG)
+        
+        print("Image processing complete.")
+        return dithered_img
     
-    def show_camera_preview(self, picam2):
+    def show_camera_preview(self):
         """
         Show a preview window with the camera feed and automatically capture after countdown.
         Returns True if photo was taken, False if cancelled.
@@ -587,6 +703,10 @@ class TCGApp:
         image_label = ttk.Label(main_frame)
         image_label.pack(expand=True)
         
+        # Preview frame rate and dropped frames
+        fps_label = ttk.Label(main_frame, text="", font=("Arial", 8), foreground="gray")
+        fps_label.pack()
+        
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
@@ -615,37 +735,29 @@ class TCGApp:
                 # Take photo after a brief moment
                 preview_window.after(500, lambda: preview_window.destroy())
         
+        # Frames are captured by a background producer; the UI only shows the newest one
+        producer = PreviewProducer(self.camera, PREVIEW_DISPLAY_SIZE)
+        producer.start()
+        
         # Update preview image function
         def update_preview():
+            if not preview_window.winfo_exists() or user_choice["cancelled"]:
+                return
             try:
-                if preview_window.winfo_exists() and not user_choice["cancelled"]:
-                    # Capture a preview frame (low resolution for speed)
-                    array = picam2.capture_array()
-                    
-                    # Convert to PIL Image
-                    if len(array.shape) == 3:  # Color image
-                        pil_image = Image.fromarray(array, 'RGB')
-                    else:  # Grayscale
-                        pil_image = Image.fromarray(array, 'L')
-                    
-                    # Resize for display (maintain aspect ratio)
-                    display_size = (400, 300)  # Preview size
-                    pil_image.thumbnail(display_size, Image.Resampling.LANCZOS)
-                    
+                pil_image = producer.latest()
+                if pil_image is not None:
                     # Convert to PhotoImage for tkinter
                     photo = ImageTk.PhotoImage(pil_image)
                     
                     # Update the label
                     image_label.configure(image=photo)
                     image_label.image = photo  # Keep a reference
-                    
-                    # Schedule next update
-                    preview_window.after(100, update_preview)  # Update every 100ms
+                    fps_label.config(text=f"{producer.fps:.1f} FPS | {producer.dropped} dropped")
             except Exception as e:
                 print(f"Preview update error: {e}")
-                # Continue trying to update
-                if preview_window.winfo_exists() and not user_choice["cancelled"]:
-                    preview_window.after(200, update_preview)
+            
+            # Schedule next update
+            preview_window.after(PREVIEW_INTERVAL_MS, update_preview)
         
         # Start preview updates and countdown
         preview_window.after(100, update_preview)
@@ -666,6 +778,7 @@ class TCGApp:
         
         # Wait for window to close
         preview_window.wait_window()
+        producer.stop()
         
         return user_choice["take_photo"] and not user_choice["cancelled"]
     
@@ -692,30 +805,33 @@ class TCGApp:
         return lines
     
     def create_receipt_record(self, person: Dict[str, Any]):
-        """Create a receipt record in the database."""
-        try:
-            # Prepare the data for the receipt record
-            receipt_data = {
+        """
+        Save a receipt record. The record is committed to the local journal
+        and delivered to PocketBase in the background, so this never waits on
+        the network and no record is lost while the database is down.
+        """
+        return self.create_receipt_records([person])[0]
+    
+    def create_receipt_records(self, people: List[Dict[str, Any]]):
+        """
+        Save one receipt record per person in a single journal transaction.
+        A booster pack is then delivered to PocketBase as one batch request.
+        """
+        created = datetime.now().isoformat() + "Z"  # ISO format timestamp
+        records = [
+            {
                 "person": person.get('id'),  # Relation to the person
                 "reason": "other",  # Default reason as requested
-                "created": datetime.now().isoformat() + "Z"  # ISO format timestamp
+                "booth": self.booth,  # Lets each booth rebuild its own pity counter
+                "created": created
             }
-            
-            # Make POST request to create the receipt record
-            response = requests.post(
-                f"{API_URL}/collections/{RECEIPTS_COLLECTION}/records",
-                json=receipt_data,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                print("Receipt record created successfully!")
-                return response.json()
-            else:
-                raise Exception(f"Failed to create receipt record: {response.status_code} - {response.text}")
-                
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error while creating receipt record: {e}")
+            for person in people
+        ]
+        
+        journal_ids = self.receipt_journal.append_many(records)
+        print(f"{len(journal_ids)} receipt record(s) saved to journal "
+              f"(#{journal_ids[0]}{'-' + str(journal_ids[-1]) if len(journal_ids) > 1 else ''})")
+        return journal_ids
 
 def main():
     """Main function to run the application."""
@@ -725,9 +841,17 @@ def main():
     print(f"Starting TCG Receipt Generator with settings:")
     print(f"  Text width: {args.text_width} characters")
     print(f"  Image width: {args.image_width} pixels")
+    if args.archive_dir:
+        print(f"  Archiving photos to: {args.archive_dir}")
+    print(f"  Booth: {args.booth}")
+    
+    # Start the draw session now so its seed is logged before the first receipt
+    set_rng_engine(RandomEngine(args.seed))
     
     root = tk.Tk()
-    app = TCGApp(root, text_width=args.text_width, image_width=args.image_width)
+    app = TCGApp(root, text_width=args.text_width, image_width=args.image_width,
+                 archive_dir=args.archive_dir, booth=args.booth, pack_size=args.pack_size,
+                 requeue_failed=args.requeue_failed)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+/// <reference path="../pb_data/types.d.ts" />
+migrate((app) => {
+  const collection = app.findCollectionByNameOrId("pbc_1571142587")
+
+  // add field
+  collection.fields.addAt(3, new Field({
+    "autogeneratePattern": "",
+    "hidden": false,
+    "id": "text2913401624",
+    "max": 0,
+    "min": 0,
+    "name": "booth",
+    "pattern": "",
+    "presentable": false,
+    "primaryKey": false,
+    "required": false,
+    "system": false,
+    "type": "text"
+  }))
+
+  // update collection data
+  unmarshal({
+    "indexes": [
+      "CREATE INDEX `idx_receipts_person` ON `receipts` (`person`)",
+      "CREATE INDEX `idx_receipts_created` ON `receipts` (`created`)",
+      "CREATE INDEX `idx_receipts_booth_created` ON `receipts` (\n  `booth`,\n  `created`\n)"
+    ]
+  }, collection)
+
+  return app.save(collection)
+}, (app) => {
+  const collection = app.findCollectionByNameOrId("pbc_1571142587")
+
+  // remove field
+  collection.fields.removeById("text2913401624")
+
+  // update collection data
+  unmarshal({
+    "indexes": [
+      "CREATE INDEX `idx_receipts_person` ON `receipts` (`person`)",
+      "CREATE INDEX `idx_receipts_created` ON `receipts` (`created`)"
+    ]
+  }, collection)
+
+  return app.save(collection)
+})
@@ -0,0 +1,220 @@
+"""
+Pity system: guaranteed S/A draws.
+
+Each booth (or session) has a counter of draws since its last S/A. From
+SOFT_PITY_START draws on, the S/A weights are raised a little more on every
+draw, and the PITY_THRESHOLD-th draw without an S/A is always an S or A.
+
+The counters are kept in memory and written to a small SQLite file after
+each draw (one row update). If the file is missing, the counter is rebuilt
+from the booth's most recent receipts in PocketBase. Until that succeeds the
+counter is only kept in memory, and recovery is retried on later draws.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from alias_sampler import AliasSampler
+from pocketbase_client import get_client
+
+# --- Configuration ---
+DRAW_STATE_PATH = "draw_state.db"  # SQLite file with the pity counters
+PITY_RARITIES = ("S", "A")  # Rarities that reset the counter
+PITY_THRESHOLD = 50  # This many draws without an S/A guarantees one
+SOFT_PITY_START = 35  # Draws without an S/A before the S/A weights start to rise
+SOFT_PITY_STEP = 0.25  # Extra S/A weight (as a multiple of the base) per draw past the soft start
+RECOVERY_RETRY_INTERVAL = 60.0  # Seconds between recovery attempts while PocketBase is unreachable
+RECEIPTS_COLLECTION = "receipts"
+BOOTH_FIELD = "booth"  # Receipt field naming the booth that printed it
+
+def pity_weights(base_weights: Dict[str, float], since_pity: int) -> Dict[str, float]:
+    """
+    Rarity weights for the next draw after `since_pity` draws without an S/A.
+
+    Args:
+        base_weights (dict): The normal rarity weights
+        since_pity (int): Draws since the last S/A
+
+    Returns:
+        dict: Adjusted weights (the base weights if no pity applies)
+    """
+    if since_pity + 1 >= PITY_THRESHOLD:
+        # Hard pity - only S/A can be drawn
+        return {rarity: weight if rarity in PITY_RARITIES else 0.0
+                for rarity, weight in base_weights.items()}
+    if since_pity >= SOFT_PITY_START:
+        boost = 1 + SOFT_PITY_STEP * (since_pity - SOFT_PITY_START + 1)
+        return {rarity: weight * boost if rarity in PITY_RARITIES else weight
+                for rarity, weight in base_weights.items()}
+    return base_weights
+
+class DrawStateStore:
+    """SQLite table of pity counters, one row per booth/session."""
+
+    def __init__(self, path: str = DRAW_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS draw_state (
+                    session TEXT PRIMARY KEY,
+                    since_pity INTEGER NOT NULL,
+                    total_draws INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, session: str) -> Optional[Tuple[int, int]]:
+        """
+        Returns:
+            tuple or None: (draws since last S/A, total draws), or None if unknown
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT since_pity, total_draws FROM draw_state WHERE session = ?", (session,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, session: str, since_pity: int, total_draws: int) -> None:
+        """Store the counters for a session."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO draw_state VALUES (?, ?, ?, ?)",
+                (session, since_pity, total_draws, time.time())
+            )
+
+def quote_filter_value(value: str) -> str:
+    """Quote a string for a PocketBase filter expression."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def recover_since_pity(booth: str, limit: int = PITY_THRESHOLD) -> Optional[int]:
+    """
+    Count a booth's receipts since its last S/A from the receipts log in PocketBase.
+
+    Only the newest `limit` receipts are read - the counter never matters
+    beyond the pity threshold.
+
+    Args:
+        booth (str): Booth name stored in the receipts' booth field
+        limit (int): Maximum number of receipts to read
+
+    Returns:
+        int or None: Draws since the last S/A, or None if PocketBase is unreachable
+    """
+    try:
+        response = get_client().get(
+            f"/collections/{RECEIPTS_COLLECTION}/records",
+            params={
+                "filter": f'{BOOTH_FIELD}={quote_filter_value(booth)}',
+                "sort": "-created",
+                "perPage": limit,
+                "skipTotal": "true",
+                "expand": "person",
+                "fields": "expand.person.rarity",
+            }
+        )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Could not recover pity counter from receipts: {e}")
+        return None
+
+    since_pity = 0
+    for receipt in response.json().get("items", []):
+        rarity = receipt.get("expand", {}).get("person", {}).get("rarity")
+        if rarity in PITY_RARITIES:
+            break
+        since_pity += 1
+    return since_pity
+
+class PityTracker:
+    """
+    Pity counter for one booth/session.
+
+    Args:
+        session (str): Booth or session name the counter belongs to
+        store (DrawStateStore, optional): Where the counter is persisted
+    """
+
+    def __init__(self, session: str, store: Optional[DrawStateStore] = None):
+        self.session = session
+        self.store = store
+        self.since_pity = 0
+        self.total_draws = 0
+        self._loaded = False
+        self._next_recovery = 0.0
+        self._pity_hit = False  # An S/A was drawn before the counter could be recovered
+        self._samplers: Dict[tuple, AliasSampler] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Restore the counter from the store, or from the receipts log if the store has none.
+
+        If PocketBase is unreachable the tracker stays unloaded: draws are
+        counted in memory only, and recovery is tried again at most every
+        RECOVERY_RETRY_INTERVAL seconds.
+        """
+        with self._lock:
+            if self._loaded or time.monotonic() < self._next_recovery:
+                return
+            state = self.store.get(self.session) if self.store is not None else None
+            if state is not None:
+                self.since_pity, self.total_draws = state
+                print(f"Pity counter for '{self.session}': {self.since_pity} draws since last S/A")
+                self._loaded = True
+                return
+
+            recovered = recover_since_pity(self.session)
+            if recovered is None:
+                # Don't block every draw on an unreachable database - count in memory for now
+                self._next_recovery = time.monotonic() + RECOVERY_RETRY_INTERVAL
+                print(f"Pity counter for '{self.session}' not recovered yet, "
+                      f"counting from {self.since_pity} in memory")
+                return
+            if not self._pity_hit:
+                # Draws made in the meantime may or may not be in the receipts already
+                self.since_pity = max(self.since_pity, recovered)
+            print(f"Pity counter for '{self.session}' recovered from receipts: {self.since_pity}")
+            self._loaded = True
+            since_pity, total_draws = self.since_pity, self.total_draws
+        self._save(since_pity, total_draws)
+
+    def sampler(self, base_weights: Dict[str, float]) -> AliasSampler:
+        """Rarity sampler for the next draw. Samplers are cached per distinct weight set."""
+        if not self._loaded:
+            self.load()
+        weights = pity_weights(base_weights, self.since_pity)
+        key = tuple(weights.items())
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            sampler = AliasSampler.from_dict(weights)
+            self._samplers[key] = sampler
+        return sampler
+
+    def record(self, rarity: str) -> None:
+        """Update the counter after a draw. It is only saved once it has been loaded."""
+        with self._lock:
+            self.total_draws += 1
+            if rarity in PITY_RARITIES:
+                self.since_pity = 0
+                self._pity_hit = True
+            else:
+                self.since_pity += 1
+            if not self._loaded:
+                return
+            since_pity, total_draws = self.since_pity, self.total_draws
+        self._save(since_pity, total_draws)
+
+    def _save(self, since_pity: int, total_draws: int) -> None:
+        if self.store is not None:
+            try:
+                self.store.put(self.session, since_pity, total_draws)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not save pity counter: {e}")
@@ -0,0 +1,212 @@
+"""
+Shared PocketBase HTTP client.
+
+Every module talks to PocketBase through one pooled requests.Session, so calls
+reuse keep-alive connections instead of opening a new socket each time.
+"""
+
+import secrets
+import string
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# PocketBase configuration
+POCKETBASE_URL = "http://localhost:8090"
+API_URL = f"{POCKETBASE_URL}/api"
+
+# Connection settings
+CONNECT_TIMEOUT = 3  # Seconds to wait for the TCP connection
+READ_TIMEOUT = 10  # Seconds to wait for a response
+MAX_RETRIES = 3  # Retries for failed connections and gateway errors
+BACKOFF_FACTOR = 0.3  # Retry delays grow as 0.3s, 0.6s, 1.2s, ...
+POOL_SIZE = 10  # Keep-alive connections kept open per host
+
+# Pagination configuration
+RECORDS_PAGE_SIZE = 500  # Records requested per page (PocketBase allows up to 1000)
+PAGE_FETCH_WORKERS = 4  # Parallel page requests when fetching concurrently
+
+# Record IDs, in the format PocketBase generates them
+RECORD_ID_LENGTH = 15
+RECORD_ID_ALPHABET = string.ascii_lowercase + string.digits
+
+def new_record_id() -> str:
+    """
+    Generate a PocketBase record ID on the client.
+
+    Sending the ID with a create request makes it safe to repeat: if the first
+    request was committed, the second is rejected instead of creating a copy.
+    """
+    return "".join(secrets.choice(RECORD_ID_ALPHABET) for _ in range(RECORD_ID_LENGTH))
+
+class PocketBaseClient:
+    """
+    Thin wrapper around a requests.Session with connection pooling,
+    default timeouts and retry/backoff.
+
+    Idempotent requests (GET, HEAD, ...) are retried on connection errors and
+    502/503/504 responses. POST requests are only retried when the connection
+    could not be established, so a record is never created twice.
+    """
+
+    def __init__(self, base_url: str = POCKETBASE_URL,
+                 timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                 pool_size: int = POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api"
+        self.timeout = timeout
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request to a path below /api, e.g. "/collections/people/records"."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.api_url}{path}", **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def batch(self, batch_requests: List[Dict[str, Any]]) -> requests.Response:
+        """
+        Send several record operations in one /api/batch request.
+
+        Each entry is a dict with "method", "url" (including the /api prefix)
+        and optionally "body". The batch runs in a single transaction, so
+        either all operations succeed or none do. PocketBase answers 403 if
+        the batch API is disabled in its settings.
+        """
+        return self.post("/batch", json={"requests": batch_requests})
+
+    def health(self, timeout: Optional[float] = None) -> bool:
+        """Check if PocketBase is running and accessible."""
+        try:
+            response = self.get("/health", timeout=timeout or self.timeout)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+# Shared client for the whole process
+_client: Optional[PocketBaseClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> PocketBaseClient:
+    """Get the process-wide PocketBase client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PocketBaseClient()
+    return _client
+
+def configure_client(**kwargs) -> PocketBaseClient:
+    """
+    Replace the process-wide client with one using custom settings.
+
+    Accepts the same keyword arguments as PocketBaseClient.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = PocketBaseClient(**kwargs)
+    return _client
+
+def fetch_records_page(collection: str, page: int, per_page: int = RECORDS_PAGE_SIZE,
+                       filter_param: Optional[str] = None, skip_total: bool = True,
+                       fields: Optional[str] = None, sort: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fetch a single page of records from a PocketBase collection.
+    
+    Raises:
+        requests.exceptions.RequestException: On network errors or non-200 responses
+    """
+    params = {"page": page, "perPage": per_page}
+    if filter_param:
+        params["filter"] = filter_param
+    if fields:
+        params["fields"] = fields
+    if sort:
+        params["sort"] = sort
+    if skip_total:
+        # Skipping the COUNT query makes each page considerably cheaper
+        params["skipTotal"] = 1
+    
+    response = get_client().get(f"/collections/{collection}/records", params=params)
+    response.raise_for_status()
+    return response.json()
+
+def iter_records(collection: str, filter_param: Optional[str] = None,
+                 per_page: int = RECORDS_PAGE_SIZE, concurrent: bool = False,
+                 max_workers: int = PAGE_FETCH_WORKERS,
+                 fields: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every record of a collection, page by page.
+    
+    Sequential mode uses skipTotal and stops at the first short page. Concurrent
+    mode asks for the total on the first page and then fetches the remaining
+    pages in parallel, still yielding records in page order.
+    
+    Args:
+        collection (str): The collection to read
+        filter_param (str, optional): PocketBase filter expression
+        per_page (int): Records per page (PocketBase caps this at 1000)
+        concurrent (bool): Fetch the remaining pages in parallel once the total is known
+        max_workers (int): Number of parallel page requests in concurrent mode
+        fields (str, optional): Comma separated list of fields to return
+    
+    Raises:
+        requests.exceptions.RequestException: On network errors or non-200 responses
+    """
+    if not concurrent:
+        page = 1
+        while True:
+            items = fetch_records_page(collection, page, per_page, filter_param,
+                                       fields=fields).get("items", [])
+            yield from items
+            if len(items) < per_page:
+                return
+            page += 1
+    
+    first = fetch_records_page(collection, 1, per_page, filter_param,
+                               skip_total=False, fields=fields)
+    yield from first.get("items", [])
+    total_pages = first.get("totalPages", 1)
+    if total_pages <= 1:
+        return
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(fetch_records_page, collection, page, per_page,
+                            filter_param, True, fields)
+            for page in range(2, total_pages + 1)
+        ]
+        for future in futures:
+            yield from future.result().get("items", [])
@@ -1,69 +1,475 @@
 import json
+import hashlib
+import itertools
 import requests
 import os
-from typing import Dict, Any
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from pocketbase_client import POCKETBASE_URL, get_client, iter_records
 
 # PocketBase configuration
-POCKETBASE_URL = "http://localhost:8090"  # Default PocketBase URL
-API_URL = f"{POCKETBASE_URL}/api"
 COLLECTION_NAME = "people"
+RECEIPTS_COLLECTION = "receipts"
+
+# Bulk import configuration
+BATCH_SIZE = 50  # Records per batch request (PocketBase's default batch limit)
+IMPORT_WORKERS = 8  # Concurrent batch or record requests during bulk import
+PROGRESS_INTERVAL = 1.0  # Seconds between progress reports
+
+# Input file configuration
+FIGURES_KEY = "historical_figures"  # Array of figures inside people.json
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")  # Files read as one figure per line
+READ_CHUNK_SIZE = 64 * 1024  # Characters read at a time while streaming
+
+def default_people_file() -> str:
+    """Path of files/people.json next to this script."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, "files", "people.json")
+
+def iter_json_array(file, key: Optional[str] = FIGURES_KEY,
+                    chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Incrementally yield the items of a JSON array without loading the file.
+    
+    The array is either the top-level value of the file, or the value of
+    `key` in a top-level object. Only one item plus one read chunk is kept in
+    memory at a time. The values of other keys before `key` are decoded and
+    skipped, so a nested or quoted "historical_figures" is never matched.
+    
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size)
+    eof = not buffer
+    pos = 0
+    
+    def fill() -> bool:
+        """Read another chunk, dropping what has already been parsed."""
+        nonlocal buffer, pos, eof
+        data = file.read(chunk_size)
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[pos:] + data
+        pos = 0
+        return True
+    
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+    
+    def decode_value() -> Any:
+        """Decode the JSON value at `pos`, reading more chunks until it is complete."""
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value ending exactly at the buffer edge may be cut short
+                if end < len(buffer) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+    
+    def expect(delimiters: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `delimiters`."""
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] not in delimiters:
+            expected = " or ".join(repr(char) for char in delimiters)
+            raise json.JSONDecodeError(f"Expecting {expected}", buffer, pos)
+        pos += 1
+        return buffer[pos - 1]
+    
+    # Find the opening bracket of the array
+    skip_whitespace()
+    if buffer[pos:pos + 1] == "[" or key is None:
+        expect("[")
+    else:
+        # Walk the keys of the top-level object, skipping the values of the others
+        expect("{")
+        skip_whitespace()
+        if buffer[pos:pos + 1] == "}":
+            raise json.JSONDecodeError(f'No "{key}" array found', buffer, pos)
+        while True:
+            skip_whitespace()
+            if buffer[pos:pos + 1] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, pos)
+            name = decode_value()
+            expect(":")
+            skip_whitespace()
+            if name == key and buffer[pos:pos + 1] == "[":
+                pos += 1
+                break
+            decode_value()
+            if expect(",}") == "}":
+                raise json.JSONDecodeError(f'No "{key}" array found', buffer, pos)
+    
+    skip_whitespace()
+    if buffer[pos:pos + 1] == "]":
+        return
+    while True:
+        yield decode_value()
+        if expect(",]") == "]":
+            return
 
-def load_historical_figures() -> list:
+def iter_historical_figures(file_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream historical figures from people.json or a JSON Lines file.
+    
+    Files ending in .jsonl/.ndjson are read one figure per line; other files
+    are parsed incrementally from their "historical_figures" array.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    file_path = file_path or default_people_file()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        if file_path.endswith(JSON_LINES_EXTENSIONS):
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(file)
+
+def load_historical_figures(file_path: Optional[str] = None) -> list:
     """Load historical figures from the JSON file."""
+    file_path = file_path or default_people_file()
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        json_file_path = os.path.join(script_dir, "files", "people.json")
-        
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            return data.get("historical_figures", [])
+        return list(iter_historical_figures(file_path))
     except FileNotFoundError:
-        print(f"Error: Could not find people.json file at {json_file_path}")
+        print(f"Error: Could not find people file at {file_path}")
         return []
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON format - {e}")
         return []
 
+def build_person_record(person: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a figure from people.json into a PocketBase record."""
+    # Extract description (use English version)
+    description = person.get("description", "")
+    if isinstance(description, dict):
+        description = description.get("en", "")
+    
+    return {
+        "name": person.get("name", ""),
+        "rarity": person.get("rarity", ""),
+        "description": description
+    }
+
+def record_operation(method: str, record: Optional[Dict[str, Any]] = None,
+                     record_id: Optional[str] = None, name: str = "") -> Dict[str, Any]:
+    """
+    Describe a single create/update/delete on the people collection.
+    
+    The same operation can be sent on its own or as part of a batch request.
+    """
+    path = f"/collections/{COLLECTION_NAME}/records"
+    if record_id:
+        path += f"/{record_id}"
+    return {
+        "method": method,
+        "path": path,
+        "body": record,
+        "name": name or (record or {}).get("name", record_id or "")
+    }
+
+def execute_operation(operation: Dict[str, Any]) -> Optional[str]:
+    """
+    Send a single operation to PocketBase.
+    
+    Returns:
+        str or None: An error message, or None if the operation succeeded
+    """
+    try:
+        response = get_client().request(operation["method"], operation["path"], json=operation["body"])
+        if response.status_code in (200, 204):
+            return None
+        return f"{response.status_code} - {response.text}"
+    except requests.exceptions.RequestException as e:
+        return f"Network error: {e}"
+
 def create_person_record(person: Dict[str, Any]) -> bool:
     """Create a person record in PocketBase."""
     try:
-        # Extract description (use English version)
-        description = person.get("description", "")
-        if isinstance(description, dict):
-            description = description.get("en", "")
-        
         # Prepare the data for PocketBase
-        record_data = {
-            "name": person.get("name", ""),
-            "rarity": person.get("rarity", ""),
-            "description": description
-        }
+        record_data = build_person_record(person)
         
         # Make POST request to create the record
-        response = requests.post(
-            f"{API_URL}/collections/{COLLECTION_NAME}/records",
-            json=record_data,
-            headers={"Content-Type": "application/json"}
-        )
+        error = execute_operation(record_operation("POST", record_data))
         
-        if response.status_code == 200:
+        if error is None:
             print(f"✓ Successfully added: {record_data['name']} (Rarity: {record_data['rarity']})")
             return True
         else:
-            print(f"✗ Failed to add {record_data['name']}: {response.status_code} - {response.text}")
+            print(f"✗ Failed to add {record_data['name']}: {error}")
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"✗ Network error while adding {person.get('name', 'Unknown')}: {e}")
-        return False
     except Exception as e:
         print(f"✗ Unexpected error while adding {person.get('name', 'Unknown')}: {e}")
         return False
 
+def send_batch(operations: List[Dict[str, Any]]) -> requests.Response:
+    """
+    Send several operations in one PocketBase batch request.
+    
+    The batch runs in a single transaction, so either all operations succeed
+    or none do.
+    """
+    batch_requests = []
+    for operation in operations:
+        batch_request = {"method": operation["method"], "url": f"/api{operation['path']}"}
+        if operation["body"] is not None:
+            batch_request["body"] = operation["body"]
+        batch_requests.append(batch_request)
+    return get_client().batch(batch_requests)
+
+def run_chunk(operations: List[Dict[str, Any]], state: Dict[str, bool]) -> List[Tuple[str, str]]:
+    """
+    Run one chunk of operations.
+    
+    Uses the batch API while it is available. If the batch API is disabled the
+    shared state switches every worker to single requests; if a batch is
+    rejected, or could not be sent at all, its operations are retried one by
+    one to find the failing ones. A batch that was sent but got no answer
+    (e.g. a read timeout) may have been committed, so it is reported as failed
+    instead of being sent again.
+    
+    Returns:
+        list: (name, error) tuples for operations that failed
+    """
+    if state["use_batch"]:
+        try:
+            response = send_batch(operations)
+            if response.status_code == 200:
+                return []
+            if response.status_code in (403, 404):
+                # Batch API is disabled in the PocketBase settings (or not supported)
+                if state["use_batch"]:
+                    print("Batch API not available, falling back to concurrent single requests")
+                state["use_batch"] = False
+        except requests.exceptions.ConnectionError as e:
+            # The request never reached PocketBase, so nothing was written
+            print(f"Batch request failed, retrying operations individually: {e}")
+        except requests.exceptions.RequestException as e:
+            print(f"✗ Batch of {len(operations)} operations failed, outcome unknown: {e}")
+            return [(operation["name"], f"Batch outcome unknown, not retried: {e}")
+                    for operation in operations]
+    
+    failures = []
+    for operation in operations:
+        error = execute_operation(operation)
+        if error is not None:
+            failures.append((operation["name"], error))
+    return failures
+
+def run_operations(operations: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE,
+                   workers: int = IMPORT_WORKERS) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Run operations in chunks using the batch API, or a bounded pool of
+    concurrent single requests when batching is unavailable.
+    
+    At most two chunks per worker are in flight at once, so memory use does
+    not grow with the number of operations.
+    
+    Returns:
+        tuple: (number of successful operations, list of (name, error) failures)
+    """
+    state = {"use_batch": True}
+    success_count = 0
+    processed = 0
+    failures: List[Tuple[str, str]] = []
+    start = time.perf_counter()
+    last_report = start
+    
+    def collect(done, final: bool = False) -> None:
+        nonlocal success_count, processed, last_report
+        for future in done:
+            chunk_size = in_flight.pop(future)
+            chunk_failures = future.result()
+            failures.extend(chunk_failures)
+            success_count += chunk_size - len(chunk_failures)
+            processed += chunk_size
+        
+        now = time.perf_counter()
+        if final or now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            rate = processed / (now - start) if now > start else 0
+            print(f"Progress: {processed} processed, {len(failures)} failed ({rate:.0f} records/s)")
+    
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk = []
+        for operation in operations:
+            chunk.append(operation)
+            if len(chunk) < batch_size:
+                continue
+            
+            future = executor.submit(run_chunk, chunk, state)
+            in_flight[future] = len(chunk)
+            chunk = []
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        
+        if chunk:
+            future = executor.submit(run_chunk, chunk, state)
+            in_flight[future] = len(chunk)
+        done, _ = wait(in_flight)
+        collect(done, final=True)
+    
+    return success_count, failures
+
+def bulk_import(figures: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE,
+                workers: int = IMPORT_WORKERS) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Create a record for every figure using batched/concurrent requests.
+    
+    Returns:
+        tuple: (number of records created, list of (name, error) failures)
+    """
+    operations = (record_operation("POST", build_person_record(person)) for person in figures)
+    return run_operations(operations, batch_size, workers)
+
+def record_fingerprint(record: Dict[str, Any]) -> str:
+    """Hash the synced fields of a record so changes can be detected cheaply."""
+    key = json.dumps([record.get("name", ""), record.get("rarity", ""), record.get("description", "")],
+                     ensure_ascii=False)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def plan_sync(figures: Iterable[Dict[str, Any]], existing: Iterable[Dict[str, Any]],
+              delete_removed: bool = True, delete_duplicates: bool = False,
+              referenced: Iterable[str] = (), allow_empty: bool = False
+              ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Compare people.json with the records already in PocketBase.
+    
+    People are matched by name. When several records share a name, the one
+    referenced by receipts is the one kept in sync. Records that receipts
+    point to are never deleted, since deleting them would clear the person
+    on those receipts.
+    
+    Args:
+        figures: Figures from people.json
+        existing: Current PocketBase records (id, name, rarity, description)
+        delete_removed (bool): Delete records that are no longer in the file
+        delete_duplicates (bool): Delete extra records with the same name
+            left behind by earlier imports
+        referenced: IDs of people that receipts point to
+        allow_empty (bool): Allow deleting records when the file has no figures
+    
+    Returns:
+        tuple: (list of operations, dict of insert/update/delete/unchanged/kept counts)
+    
+    Raises:
+        ValueError: If the file has no figures and the plan would delete records
+    """
+    operations = []
+    counts = {"insert": 0, "update": 0, "delete": 0, "unchanged": 0, "kept": 0}
+    referenced = set(referenced)
+    
+    def delete(record_id: str, name: str) -> None:
+        if record_id in referenced:
+            counts["kept"] += 1
+            return
+        operations.append(record_operation("DELETE", record_id=record_id, name=name))
+        counts["delete"] += 1
+    
+    records_by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for record in existing:
+        records_by_name.setdefault(record.get("name", ""), []).append(record)
+    
+    existing_by_name: Dict[str, Tuple[str, str]] = {}
+    for name, records in records_by_name.items():
+        # Keep the record receipts point to, so their history stays intact
+        keeper = next((record for record in records if record["id"] in referenced), records[0])
+        existing_by_name[name] = (keeper["id"], record_fingerprint(keeper))
+        if delete_duplicates:
+            for record in records:
+                if record is not keeper:
+                    delete(record["id"], name)
+    
+    seen = set()
+    for person in figures:
+        record = build_person_record(person)
+        name = record["name"]
+        if name in seen:
+            continue
+        seen.add(name)
+        
+        current = existing_by_name.get(name)
+        if current is None:
+            operations.append(record_operation("POST", record))
+            counts["insert"] += 1
+        elif current[1] != record_fingerprint(record):
+            operations.append(record_operation("PATCH", record, record_id=current[0]))
+            counts["update"] += 1
+        else:
+            counts["unchanged"] += 1
+    
+    if delete_removed:
+        for name, (record_id, _) in existing_by_name.items():
+            if name not in seen:
+                delete(record_id, name)
+    
+    if not seen and counts["delete"] and not allow_empty:
+        # An empty or truncated file would otherwise wipe the whole roster
+        raise ValueError(f"The people file has no figures; refusing to delete {counts['delete']} record(s)")
+    
+    return operations, counts
+
+def sync_people(figures: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE,
+                workers: int = IMPORT_WORKERS, delete_removed: bool = True,
+                delete_duplicates: bool = False, allow_empty: bool = False
+                ) -> Optional[Tuple[int, List[Tuple[str, str]], Dict[str, int]]]:
+    """
+    Bring the people collection in line with people.json, sending only the
+    inserts, updates and deletes that are actually needed.
+    
+    Returns:
+        tuple or None: (successful operations, failures, planned counts), or
+        None if the existing records could not be fetched or the plan was refused
+    """
+    try:
+        existing = list(iter_records(COLLECTION_NAME, concurrent=True,
+                                     fields="id,name,rarity,description"))
+        referenced = {receipt.get("person") for receipt in
+                      iter_records(RECEIPTS_COLLECTION, concurrent=True, fields="person")}
+    except requests.exceptions.RequestException as e:
+        print(f"✗ Could not fetch existing people and receipts: {e}")
+        return None
+    
+    try:
+        operations, counts = plan_sync(figures, existing, delete_removed, delete_duplicates,
+                                       referenced, allow_empty)
+    except ValueError as e:
+        print(f"✗ {e} (use --allow-empty to do this on purpose)")
+        return None
+    print(f"Sync plan: {counts['insert']} to insert, {counts['update']} to update, "
+          f"{counts['delete']} to delete, {counts['unchanged']} unchanged")
+    if counts["kept"]:
+        print(f"Keeping {counts['kept']} record(s) that receipts still point to")
+    
+    success_count, failures = run_operations(operations, batch_size, workers)
+    return success_count, failures, counts
+
 def check_pocketbase_connection() -> bool:
     """Check if PocketBase is running and accessible."""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
+        response = get_client().get("/health", timeout=5)
         if response.status_code == 200:
             print(f"✓ Connected to PocketBase at {POCKETBASE_URL}")
             return True
@@ -75,8 +481,32 @@ def check_pocketbase_connection() -> bool:
         print("Make sure PocketBase is running on localhost:8090")
         return False
 
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Populate PocketBase with historical figures')
+    parser.add_argument('--mode', choices=['bulk', 'sync', 'serial'], default='bulk',
+                       help='bulk: batch API / concurrent requests, sync: only apply changes '
+                            'to existing records, serial: one request at a time (default: bulk)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                       help=f'Records per batch request in bulk mode (default: {BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, default=IMPORT_WORKERS,
+                       help=f'Concurrent requests in bulk mode (default: {IMPORT_WORKERS})')
+    parser.add_argument('--file', default=None,
+                       help='People file to import: JSON with a "historical_figures" array, '
+                            'or JSON Lines (.jsonl) with one figure per line (default: files/people.json)')
+    parser.add_argument('--keep-removed', action='store_true',
+                       help='In sync mode, keep records that are no longer in people.json')
+    parser.add_argument('--delete-duplicates', action='store_true',
+                       help='In sync mode, delete extra records with the same name '
+                            '(records that receipts point to are always kept)')
+    parser.add_argument('--allow-empty', action='store_true',
+                       help='In sync mode, allow an empty people file to delete every record')
+    return parser.parse_args()
+
 def main():
     """Main function to populate the database."""
+    args = parse_arguments()
+    
     print("Starting database population...")
     print("=" * 50)
     
@@ -84,31 +514,72 @@ def main():
     if not check_pocketbase_connection():
         return
     
-    # Load historical figures
-    historical_figures = load_historical_figures()
-    if not historical_figures:
-        print("No historical figures found to add.")
-        return
-    
-    print(f"Found {len(historical_figures)} historical figures to add.")
+    # Stream historical figures straight into the import
+    file_path = args.file or default_people_file()
+    print(f"Reading historical figures from {file_path}")
     print("-" * 50)
     
-    # Add each person to the database
-    success_count = 0
-    failed_count = 0
+    read = {"count": 0}
+    def count_figures(figures):
+        for person in figures:
+            read["count"] += 1
+            yield person
     
-    for person in historical_figures:
-        if create_person_record(person):
-            success_count += 1
+    start = time.perf_counter()
+    try:
+        # Peek at the first figure so an empty file stops here, before anything is sent
+        figures = iter_historical_figures(file_path)
+        first = next(figures, None)
+        if first is None and not (args.mode == 'sync' and args.allow_empty):
+            print("No historical figures found to add.")
+            return
+        historical_figures = count_figures(figures if first is None else itertools.chain([first], figures))
+        
+        if args.mode == 'sync':
+            result = sync_people(historical_figures, args.batch_size, args.workers,
+                                 delete_removed=not args.keep_removed,
+                                 delete_duplicates=args.delete_duplicates,
+                                 allow_empty=args.allow_empty)
+            if result is None:
+                return
+            success_count, failures, _ = result
+            failed_count = len(failures)
+            for name, error in failures:
+                print(f"✗ Failed to sync {name}: {error}")
+        elif args.mode == 'bulk':
+            success_count, failures = bulk_import(historical_figures, args.batch_size, args.workers)
+            failed_count = len(failures)
+            for name, error in failures:
+                print(f"✗ Failed to add {name}: {error}")
         else:
-            failed_count += 1
+            # Add each person to the database
+            success_count = 0
+            failed_count = 0
+            
+            for person in historical_figures:
+                if create_person_record(person):
+                    success_count += 1
+                else:
+                    failed_count += 1
+    except FileNotFoundError:
+        print(f"Error: Could not find people file at {file_path}")
+        return
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON format - {e}")
+        print(f"Stopped after {read['count']} figures")
+        return
+    elapsed = time.perf_counter() - start
     
     # Summary
     print("-" * 50)
-    print(f"Database population completed!")
-    print(f"Successfully added: {success_count} records")
-    print(f"Failed to add: {failed_count} records")
-    print(f"Total processed: {len(historical_figures)} records")
+    print(f"Database population completed in {elapsed:.1f}s!")
+    if args.mode == 'sync':
+        print(f"Successfully applied: {success_count} changes")
+        print(f"Failed to apply: {failed_count} changes")
+    else:
+        print(f"Successfully added: {success_count} records")
+        print(f"Failed to add: {failed_count} records")
+    print(f"Total processed: {read['count']} records")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,229 @@
+"""
+Print spooler.
+
+Compiled receipts are written to a spool folder and printed by a single
+background worker, so the app can move on to the next customer while the
+previous receipt is still feeding. Spool files are only removed after a
+receipt has printed, so queued receipts survive a crash or power loss and are
+printed when the app starts again. While the printer is unreachable the
+worker waits with the current job at the head of the queue; only errors while
+the printer is connected count towards a job's attempts. Jobs that still fail
+are moved to spool/failed/ and stay there until an operator requeues them.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+# --- Configuration ---
+SPOOL_DIR = "spool"  # Folder for receipts waiting to be printed
+FAILED_DIR = "failed"  # Subfolder for receipts that could not be printed
+SPOOL_QUEUE_SIZE = 16  # Maximum number of receipts waiting in memory
+SUBMIT_TIMEOUT = 2.0  # Seconds to wait for room in a full queue
+MAX_PRINT_ATTEMPTS = 5  # Attempts per receipt before it is moved to the failed folder
+RETRY_BACKOFF = 1.0  # Seconds before the first retry, doubled on each further attempt
+MAX_RETRY_BACKOFF = 30.0  # Upper limit for the retry delay
+PRINTER_WAIT_INTERVAL = 5.0  # Seconds between reconnect attempts while the printer is unreachable
+
+# Job statuses reported to the status callback
+QUEUED = "queued"
+PRINTING = "printing"
+RETRYING = "retrying"
+WAITING = "waiting"
+DONE = "done"
+FAILED = "failed"
+
+StatusCallback = Callable[[str, str, str], None]
+
+class PrintSpooler:
+    """
+    Bounded queue of print jobs with one dedicated printer worker.
+
+    Args:
+        print_bytes: Function that sends a compiled receipt to the printer
+        spool_dir (str): Folder where pending receipts are stored
+        maxsize (int): Maximum number of queued jobs
+        on_status: Called as on_status(job_id, status, message) from the worker thread
+        connect: Opens the printer and returns True if it is reachable; while it
+            returns False the worker waits instead of using up the job's attempts
+    """
+
+    def __init__(self, print_bytes: Callable[[bytes], None], spool_dir: str = SPOOL_DIR,
+                 maxsize: int = SPOOL_QUEUE_SIZE, on_status: Optional[StatusCallback] = None,
+                 connect: Optional[Callable[[], bool]] = None):
+        self.print_bytes = print_bytes
+        self.connect = connect
+        self.spool_dir = spool_dir
+        self.on_status = on_status
+        self.statuses: Dict[str, str] = {}
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=maxsize)
+        self._recovered: List[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting to be printed."""
+        return self._queue.qsize() + len(self._recovered)
+
+    def start(self) -> None:
+        """Pick up receipts left over from a previous run and start the worker."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._recovered = sorted(
+            name[:-len(".bin")] for name in os.listdir(self.spool_dir) if name.endswith(".bin")
+        )
+        if self._recovered:
+            print(f"Recovered {len(self._recovered)} unprinted receipt(s) from {self.spool_dir}")
+            for job_id in self._recovered:
+                self._set_status(job_id, QUEUED, "Recovered from spool")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def requeue_failed(self) -> int:
+        """
+        Move receipts from the failed folder back into the spool folder.
+
+        Call this before `start()` to print them again (main.py --requeue-failed).
+
+        Returns:
+            int: Number of receipts moved back
+        """
+        failed_dir = os.path.join(self.spool_dir, FAILED_DIR)
+        if not os.path.isdir(failed_dir):
+            return 0
+        moved = 0
+        for name in sorted(os.listdir(failed_dir)):
+            if not name.endswith(".bin"):
+                continue
+            try:
+                os.replace(os.path.join(failed_dir, name), os.path.join(self.spool_dir, name))
+                moved += 1
+            except OSError as e:
+                print(f"Warning: Could not requeue failed print job {name}: {e}")
+        if moved:
+            print(f"Moved {moved} failed receipt(s) back into the print queue")
+        return moved
+
+    def stop(self) -> None:
+        """Stop the worker after the current job. Unprinted receipts stay in the spool folder."""
+        self._stop.set()
+
+    def submit(self, data: bytes, label: str = "") -> str:
+        """
+        Spool a compiled receipt and queue it for printing.
+
+        Returns:
+            str: The job ID
+
+        Raises:
+            RuntimeError: If the queue stays full for longer than SUBMIT_TIMEOUT
+        """
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        path = self._job_path(job_id)
+
+        # Write to a temporary file first so a crash never leaves a half-written receipt
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with open(path + ".tmp", 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+
+        self._set_status(job_id, QUEUED, label)
+        try:
+            self._queue.put(job_id, timeout=SUBMIT_TIMEOUT)
+        except queue.Full:
+            os.remove(path)
+            self.statuses.pop(job_id, None)
+            raise RuntimeError("Print queue is full")
+        return job_id
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._recovered:
+                job_id = self._recovered.pop(0)
+            else:
+                try:
+                    job_id = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+            self._print_job(job_id)
+
+    def _print_job(self, job_id: str) -> None:
+        """Print one job, retrying with backoff on errors."""
+        path = self._job_path(job_id)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError as e:
+            self._set_status(job_id, FAILED, f"Could not read spool file: {e}")
+            return
+
+        delay = RETRY_BACKOFF
+        for attempt in range(1, MAX_PRINT_ATTEMPTS + 1):
+            if not self._wait_for_printer(job_id):
+                return
+            self._set_status(job_id, PRINTING, f"Attempt {attempt}")
+            try:
+                self.print_bytes(data)
+            except Exception as e:
+                if attempt == MAX_PRINT_ATTEMPTS:
+                    self._move_to_failed(job_id)
+                    self._set_status(job_id, FAILED, str(e))
+                    return
+                self._set_status(job_id, RETRYING, f"{e} - retrying in {delay:.0f}s")
+                if self._stop.wait(delay):
+                    return
+                delay = min(delay * 2, MAX_RETRY_BACKOFF)
+                continue
+
+            os.remove(path)
+            self._set_status(job_id, DONE, "")
+            return
+
+    def _wait_for_printer(self, job_id: str) -> bool:
+        """
+        Block until the printer can be opened, keeping the job at the head of the queue.
+
+        Returns:
+            bool: True if the printer is reachable, False if the spooler was stopped
+        """
+        if self.connect is None:
+            return True
+        waiting = False
+        while not self.connect():
+            if not waiting:
+                self._set_status(job_id, WAITING, "Printer not reachable - waiting for it to come back")
+                waiting = True
+            if self._stop.wait(PRINTER_WAIT_INTERVAL):
+                return False
+        return True
+
+    def _move_to_failed(self, job_id: str) -> None:
+        failed_dir = os.path.join(self.spool_dir, FAILED_DIR)
+        try:
+            os.makedirs(failed_dir, exist_ok=True)
+            os.replace(self._job_path(job_id), os.path.join(failed_dir, f"{job_id}.bin"))
+        except OSError as e:
+            print(f"Warning: Could not move failed print job {job_id}: {e}")
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{job_id}.bin")
+
+    def _set_status(self, job_id: str, status: str, message: str) -> None:
+        # Finished jobs are forgotten so the status table does not grow forever
+        if status == DONE:
+            self.statuses.pop(job_id, None)
+        else:
+            self.statuses[job_id] = status
+        print(f"Print job {job_id}: {status}{' - ' + message if message else ''}")
+        if self.on_status is not None:
+            try:
+                self.on_status(job_id, status, message)
+            except Exception as e:
+                print(f"Print status callback error: {e}")
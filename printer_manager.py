@@ -0,0 +1,156 @@
+"""
+Persistent thermal printer connection.
+
+The USB printer is opened once and kept open between receipts. The code page
+is negotiated on the first connection and reused afterwards. If the printer is
+unplugged or a write fails, the connection is dropped and reopened on the next
+job.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from escpos.printer import Usb
+
+WRITE_CHUNK_SIZE = 4096  # Bytes per USB write when sending a compiled receipt
+
+# Code pages to try, in order of preference
+CODE_PAGES = (
+    'CP865',  # Norwegian/Danish
+    'CP850',  # Western European
+    'CP437',  # Original IBM PC
+)
+
+def setup_printer_encoding(printer, code_pages=CODE_PAGES) -> Optional[str]:
+    """
+    Configure printer for Norwegian/Danish characters.
+    Returns the code page that was set, or None if none of them worked.
+    """
+    for code_page in code_pages:
+        try:
+            printer.charcode(code_page)
+            return code_page
+        except Exception:
+            continue
+    # If all encoding attempts fail, continue without encoding
+    print("Warning: Could not set printer encoding for special characters")
+    return None
+
+def write_buffer(printer, data: bytes, chunk_size: int = WRITE_CHUNK_SIZE) -> None:
+    """Send pre-rendered ESC/POS bytes to the printer in a few large writes."""
+    for offset in range(0, len(data), chunk_size):
+        printer._raw(data[offset:offset + chunk_size])
+
+class PrinterManager:
+    """
+    Owns the USB connection to the thermal printer.
+
+    Jobs borrow the printer with `session()`. Sessions are serialized with a
+    lock so several worker threads can print without interleaving receipts.
+    """
+
+    def __init__(self, vendor_id: int, product_id: int, interface: int = 0,
+                 in_ep: int = 0x82, out_ep: int = 0x03, profile: str = "simple"):
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.interface = interface
+        self.in_ep = in_ep
+        self.out_ep = out_ep
+        self.profile = profile
+        self.printer = None
+        self.code_page: Optional[str] = None
+        self._code_page_negotiated = False
+        self._lock = threading.RLock()
+
+    @property
+    def connected(self) -> bool:
+        """True if the printer is currently open."""
+        return self.printer is not None
+
+    def connect(self) -> bool:
+        """
+        Open the printer if it is not open already.
+
+        Returns:
+            bool: True if the printer is open
+        """
+        with self._lock:
+            if self.printer is not None:
+                return True
+            try:
+                printer = Usb(self.vendor_id, self.product_id, self.interface,
+                              profile=self.profile, in_ep=self.in_ep, out_ep=self.out_ep)
+                printer.open()
+            except Exception as e:
+                print(f"Could not open printer: {e}")
+                return False
+
+            # Negotiate the code page once, then reuse the result on reconnects
+            if not self._code_page_negotiated:
+                self.code_page = setup_printer_encoding(printer)
+                self._code_page_negotiated = True
+                if self.code_page:
+                    print(f"Printer encoding configured for Norwegian characters ({self.code_page})")
+            elif self.code_page:
+                try:
+                    printer.charcode(self.code_page)
+                except Exception as e:
+                    print(f"Could not restore printer encoding {self.code_page}: {e}")
+
+            self.printer = printer
+            print("Printer connected")
+            return True
+
+    def disconnect(self) -> None:
+        """Close the printer, ignoring errors from a device that is already gone."""
+        with self._lock:
+            if self.printer is None:
+                return
+            try:
+                self.printer.close()
+            except Exception as e:
+                print(f"Warning: Error while closing printer: {e}")
+            self.printer = None
+
+    @contextmanager
+    def session(self) -> Iterator[object]:
+        """
+        Borrow the open printer, connecting first if needed.
+
+        If anything fails while the printer is borrowed, the connection is
+        dropped so the next session reconnects.
+
+        Raises:
+            RuntimeError: If the printer could not be opened
+        """
+        with self._lock:
+            if not self.connect():
+                raise RuntimeError("Printer not connected")
+            try:
+                yield self.printer
+            except Exception:
+                print("Printer error, dropping connection")
+                self.disconnect()
+                raise
+
+    def run(self, job: Callable[[object], Any], retries: int = 1) -> Any:
+        """
+        Run `job(printer)` in a session, reconnecting and retrying if it fails.
+
+        A stale USB handle (printer unplugged and plugged back in) usually fails
+        on the first write, so one retry after reconnecting is normally enough
+        to recover without the caller noticing.
+        """
+        for attempt in range(retries + 1):
+            try:
+                with self.session() as printer:
+                    return job(printer)
+            except Exception as e:
+                if attempt >= retries:
+                    raise
+                print(f"Print job failed ({e}), reconnecting and retrying...")
+
+    def print_bytes(self, data: bytes, retries: int = 1) -> None:
+        """Send a compiled ESC/POS buffer, reconnecting and retrying if needed."""
+        self.run(lambda printer: write_buffer(printer, data), retries)
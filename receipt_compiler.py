@@ -0,0 +1,206 @@
+"""
+ESC/POS receipt compiler.
+
+Renders a whole receipt (header, person, timestamp and photo), or a booster
+pack of several cards, into a single ESC/POS byte buffer. The buffer can be
+sent to the printer in a few large USB writes, or saved to a file when no
+printer is connected - the bytes are the same either way.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# --- ESC/POS commands ---
+ESC = b"\x1b"
+GS = b"\x1d"
+INIT = ESC + b"@"  # Reset printer settings
+
+ALIGNMENTS = {"left": 0, "center": 1, "right": 2}
+
+# ESC t code page numbers and the matching Python codecs
+CODE_PAGES = {
+    "CP437": (0, "cp437"),
+    "CP850": (2, "cp850"),
+    "CP865": (5, "cp865"),
+}
+DEFAULT_CODE_PAGE = "CP865"
+
+# ESC ! print mode bits
+MODE_FONT_B = 0x01
+MODE_BOLD = 0x08
+MODE_DOUBLE_HEIGHT = 0x10
+
+# Booster pack layout
+PACK_SEPARATOR = "-" * 32  # Line between cards (one full line of font A on 58 mm paper)
+PACK_DESCRIPTION_LENGTH = 120  # Characters of each card's description on a pack receipt
+
+IMAGE_SLICE_HEIGHT = 256  # Raster rows per image command, keeps each command within small printer buffers
+
+# Maps every byte to its bitwise inverse (Pillow uses 1 = white, ESC/POS uses 1 = black)
+_INVERT = bytes(255 - value for value in range(256))
+
+class ReceiptBuilder:
+    """
+    Collects ESC/POS commands in memory.
+
+    Mirrors the small subset of the python-escpos printer API the receipts
+    use (set, text, ln, image), but only appends bytes to a buffer.
+    """
+
+    def __init__(self, code_page: Optional[str] = DEFAULT_CODE_PAGE):
+        self._buffer = bytearray(INIT)
+        self.encoding = "cp437"  # The printer's power-on code page
+        if code_page in CODE_PAGES:
+            number, self.encoding = CODE_PAGES[code_page]
+            self._buffer += ESC + b"t" + bytes([number])
+
+    def set(self, align: str = "left", bold: bool = False,
+            double_height: bool = False, font: str = "a") -> None:
+        """Set alignment and text style."""
+        mode = 0
+        if font == "b":
+            mode |= MODE_FONT_B
+        if bold:
+            mode |= MODE_BOLD
+        if double_height:
+            mode |= MODE_DOUBLE_HEIGHT
+        self._buffer += ESC + b"a" + bytes([ALIGNMENTS.get(align, 0)])
+        self._buffer += ESC + b"!" + bytes([mode])
+
+    def text(self, text: str) -> None:
+        """Add text in the printer's code page; unsupported characters become '?'."""
+        self._buffer += text.encode(self.encoding, errors="replace")
+
+    def ln(self, count: int = 1) -> None:
+        """Add line feeds."""
+        self._buffer += b"\n" * count
+
+    def image(self, image) -> None:
+        """Add a PIL image as raster bit image data (GS v 0)."""
+        from PIL import Image
+
+        mono = image.convert("1")
+        width, height = mono.size
+        width_bytes = (width + 7) // 8
+
+        # Pad to a whole number of bytes with white so no stray dots are printed
+        if width % 8:
+            padded = Image.new("1", (width_bytes * 8, height), 1)
+            padded.paste(mono, (0, 0))
+            mono = padded
+
+        data = mono.tobytes().translate(_INVERT)
+        for top in range(0, height, IMAGE_SLICE_HEIGHT):
+            rows = min(IMAGE_SLICE_HEIGHT, height - top)
+            self._buffer += GS + b"v0" + bytes([0,
+                                                 width_bytes & 0xFF, width_bytes >> 8,
+                                                 rows & 0xFF, rows >> 8])
+            self._buffer += data[top * width_bytes:(top + rows) * width_bytes]
+
+    def getvalue(self) -> bytes:
+        """The compiled ESC/POS bytes."""
+        return bytes(self._buffer)
+
+def _add_header(receipt: ReceiptBuilder, title: str) -> None:
+    receipt.set(align='center', bold=True, double_height=True, font='b')
+    receipt.text(f"{title}\n")
+    receipt.ln(1)
+
+def _add_footer(receipt: ReceiptBuilder, image: Optional[object], timestamp: Optional[datetime]) -> None:
+    # Print date and time
+    current_time = (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    receipt.set(align='center', bold=False)
+    receipt.text(f"Generated: {current_time}\n")
+    receipt.ln(2)
+
+    # Print image if available
+    if image is not None:
+        receipt.set(align='center')
+        receipt.image(image)
+        receipt.ln(2)
+
+    receipt.ln(2)
+
+def compile_receipt(person: Dict[str, Any], image: Optional[object] = None,
+                    code_page: Optional[str] = DEFAULT_CODE_PAGE,
+                    timestamp: Optional[datetime] = None) -> bytes:
+    """
+    Render a complete receipt for a person into one ESC/POS byte buffer.
+
+    Args:
+        person (dict): Person record with name, rarity and description
+        image (PIL.Image, optional): Processed photo to print below the text
+        code_page (str, optional): Printer code page (CP865, CP850 or CP437)
+        timestamp (datetime, optional): Time printed on the receipt (default: now)
+
+    Returns:
+        bytes: The ESC/POS commands for the whole receipt
+    """
+    receipt = ReceiptBuilder(code_page)
+
+    # Print header
+    _add_header(receipt, "IKT RECEIPT")
+
+    # Print person info
+    receipt.set(align='center', bold=True, double_height=False)
+    receipt.text(f"{person.get('name', 'Unknown')}\n")
+
+    receipt.set(align='center', bold=False)
+    receipt.text(f"Rarity: {person.get('rarity', 'Unknown')}\n")
+    receipt.ln(1)
+
+    # Print description
+    receipt.set(align='left', bold=False)
+    receipt.text(person.get('description', 'No description available'))
+    receipt.ln(1)
+
+    _add_footer(receipt, image, timestamp)
+    return receipt.getvalue()
+
+def shorten(text: str, length: int) -> str:
+    """Cut text to at most `length` characters, ending on a whole word."""
+    if len(text) <= length:
+        return text
+    return text[:length - 3].rsplit(" ", 1)[0] + "..."
+
+def compile_pack_receipt(people: List[Dict[str, Any]], image: Optional[object] = None,
+                         code_page: Optional[str] = DEFAULT_CODE_PAGE,
+                         timestamp: Optional[datetime] = None) -> bytes:
+    """
+    Render a booster pack - several cards on one receipt - into one ESC/POS byte buffer.
+
+    Each card gets a compact block: rarity and name on one line, then a
+    shortened description in the small font.
+
+    Args:
+        people (list): Person records, in the order they were drawn
+        image (PIL.Image, optional): Processed photo to print below the cards
+        code_page (str, optional): Printer code page (CP865, CP850 or CP437)
+        timestamp (datetime, optional): Time printed on the receipt (default: now)
+
+    Returns:
+        bytes: The ESC/POS commands for the whole pack
+    """
+    receipt = ReceiptBuilder(code_page)
+
+    _add_header(receipt, "IKT BOOSTER PACK")
+    receipt.set(align='center', bold=False)
+    receipt.text(f"{len(people)} cards\n")
+
+    for number, person in enumerate(people, start=1):
+        receipt.set(align='left', bold=False)
+        receipt.text(PACK_SEPARATOR + "\n")
+
+        receipt.set(align='left', bold=True)
+        receipt.text(f"{number}. [{person.get('rarity', '?')}] {person.get('name', 'Unknown')}\n")
+
+        receipt.set(align='left', bold=False, font='b')
+        description = person.get('description', 'No description available')
+        receipt.text(shorten(description, PACK_DESCRIPTION_LENGTH) + "\n")
+
+    receipt.set(align='left', bold=False)
+    receipt.text(PACK_SEPARATOR + "\n")
+    receipt.ln(1)
+
+    _add_footer(receipt, image, timestamp)
+    return receipt.getvalue()
@@ -0,0 +1,252 @@
+"""
+Write-behind journal for receipt records.
+
+Receipt records are first committed to a local SQLite file and then sent to
+PocketBase in batches by a background flusher. Saving a receipt never waits
+for the network, and records written while PocketBase is down are kept until
+they can be delivered.
+
+Every record gets its PocketBase ID when it is journaled. If a request times
+out after PocketBase committed it, the resend is rejected as a duplicate ID
+and the record counts as delivered, so a receipt is never saved twice.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from pocketbase_client import get_client, new_record_id
+
+# --- Configuration ---
+JOURNAL_PATH = "receipt_journal.db"  # Local SQLite file with undelivered receipts
+FLUSH_INTERVAL = 2.0  # Seconds between delivery attempts
+FLUSH_BATCH_SIZE = 50  # Receipts per batch request
+MAX_DELIVERY_ATTEMPTS = 10  # Rejected receipts are set aside after this many attempts
+
+class ReceiptJournal:
+    """
+    Durable queue of receipt records waiting to be written to PocketBase.
+
+    Records rejected by PocketBase (4xx) are retried a limited number of times
+    and then marked as failed, so one bad record cannot block the rest. Network
+    errors never count as attempts - the flusher just waits for PocketBase.
+    """
+
+    def __init__(self, collection: str, path: str = JOURNAL_PATH,
+                 flush_interval: float = FLUSH_INTERVAL, batch_size: int = FLUSH_BATCH_SIZE):
+        self.collection = collection
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._use_batch = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=FULL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS pending_receipts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    data TEXT NOT NULL,
+                    queued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT
+                )
+            """)
+            # Journals written before records carried their own ID
+            for row_id, data in self._db.execute("SELECT id, data FROM pending_receipts").fetchall():
+                record = json.loads(data)
+                if "id" not in record:
+                    record["id"] = new_record_id()
+                    self._db.execute("UPDATE pending_receipts SET data = ? WHERE id = ?",
+                                     (json.dumps(record), row_id))
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Durably store a receipt record for delivery.
+
+        The record is given a PocketBase ID unless it already has one.
+
+        Returns:
+            int: The local journal ID of the record
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO pending_receipts (data, queued_at) VALUES (?, ?)",
+                (json.dumps(self._with_id(record)), time.time())
+            )
+        self._wake.set()
+        return cursor.lastrowid
+
+    def append_many(self, records: List[Dict[str, Any]]) -> List[int]:
+        """
+        Durably store several receipt records in one transaction, e.g. a booster pack.
+
+        The records are delivered together in one batch request as long as
+        there are no more than `batch_size` of them.
+
+        Returns:
+            list: The local journal IDs of the records
+        """
+        queued_at = time.time()
+        with self._lock, self._db:
+            row_ids = [
+                self._db.execute(
+                    "INSERT INTO pending_receipts (data, queued_at) VALUES (?, ?)",
+                    (json.dumps(self._with_id(record)), queued_at)
+                ).lastrowid
+                for record in records
+            ]
+        self._wake.set()
+        return row_ids
+
+    def pending(self) -> int:
+        """Number of records still waiting to be delivered."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM pending_receipts WHERE failed = 0"
+            ).fetchone()[0]
+
+    def flush(self) -> int:
+        """
+        Deliver pending records until the journal is empty or delivery fails.
+
+        Returns:
+            int: Number of records delivered
+        """
+        delivered = 0
+        while not self._stop.is_set():
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, data FROM pending_receipts WHERE failed = 0 ORDER BY id LIMIT ?",
+                    (self.batch_size,)
+                ).fetchall()
+            if not rows:
+                break
+
+            try:
+                sent_ids = self._send(rows)
+            except requests.exceptions.RequestException as e:
+                print(f"Receipt journal: PocketBase unreachable, will retry ({e})")
+                break
+
+            self._delete(sent_ids)
+            delivered += len(sent_ids)
+            if len(sent_ids) < len(rows):
+                break
+
+        if delivered:
+            print(f"Receipt journal: delivered {delivered} record(s)")
+        return delivered
+
+    def flush_now(self) -> None:
+        """Ask the flusher to deliver pending records right away."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the background flusher."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        pending = self.pending()
+        if pending:
+            print(f"Receipt journal: {pending} record(s) waiting for delivery")
+
+    def stop(self) -> None:
+        """Stop the flusher. Undelivered records stay in the journal."""
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Receipt journal flush error: {e}")
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+    def _send(self, rows: List[tuple]) -> List[int]:
+        """
+        Send a batch of journal rows to PocketBase.
+
+        Returns:
+            list: Journal IDs that were delivered
+
+        Raises:
+            requests.exceptions.RequestException: If PocketBase is unreachable
+        """
+        path = f"/collections/{self.collection}/records"
+        if self._use_batch:
+            response = get_client().batch([
+                {"method": "POST", "url": f"/api{path}", "body": json.loads(data)}
+                for _, data in rows
+            ])
+            if response.status_code == 200:
+                return [row_id for row_id, _ in rows]
+            if response.status_code in (403, 404):
+                # Batch API is disabled in the PocketBase settings (or not supported)
+                print("Receipt journal: batch API not available, sending records one by one")
+                self._use_batch = False
+            elif response.status_code >= 500:
+                raise requests.exceptions.HTTPError(f"PocketBase error {response.status_code}")
+
+        # One by one, so a rejected record can be identified and set aside
+        sent_ids = []
+        for row_id, data in rows:
+            response = get_client().post(path, json=json.loads(data))
+            if response.status_code == 200:
+                sent_ids.append(row_id)
+            elif response.status_code >= 500:
+                raise requests.exceptions.HTTPError(f"PocketBase error {response.status_code}")
+            elif self._already_delivered(json.loads(data)):
+                # An earlier attempt was committed, but its response never arrived
+                print(f"Receipt journal: record {row_id} was already delivered")
+                sent_ids.append(row_id)
+            else:
+                self._record_rejection(row_id, f"{response.status_code} - {response.text}")
+        return sent_ids
+
+    def _already_delivered(self, record: Dict[str, Any]) -> bool:
+        """Check whether a rejected record is already stored in PocketBase under its ID."""
+        record_id = record.get("id")
+        if not record_id:
+            return False
+        response = get_client().get(f"/collections/{self.collection}/records/{record_id}",
+                                    params={"fields": "id"})
+        if response.status_code >= 500:
+            raise requests.exceptions.HTTPError(f"PocketBase error {response.status_code}")
+        return response.status_code == 200
+
+    @staticmethod
+    def _with_id(record: Dict[str, Any]) -> Dict[str, Any]:
+        if record.get("id"):
+            return record
+        return {"id": new_record_id(), **record}
+
+    def _record_rejection(self, row_id: int, error: str) -> None:
+        print(f"Receipt journal: record {row_id} rejected: {error}")
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE pending_receipts SET attempts = attempts + 1, last_error = ?, "
+                "failed = (attempts + 1 >= ?) WHERE id = ?",
+                (error, MAX_DELIVERY_ATTEMPTS, row_id)
+            )
+
+    def _delete(self, row_ids: List[int]) -> None:
+        if not row_ids:
+            return
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM pending_receipts WHERE id = ?",
+                                 [(row_id,) for row_id in row_ids])
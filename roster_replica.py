@@ -0,0 +1,91 @@
+"""
+Local on-disk replica of the people collection.
+
+The roster cache writes every successful PocketBase load to a small SQLite
+file, indexed by rarity. On startup, or whenever PocketBase is unreachable,
+the roster is read back from this file so draws keep working offline.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# --- Configuration ---
+REPLICA_PATH = "roster_replica.db"  # SQLite file holding the last synced roster
+PERSON_WEIGHT_FIELD = "weight"  # Optional per-person weight, kept so offline draws match online ones
+
+class RosterReplica:
+    """SQLite copy of the people collection. The file is opened on first use."""
+
+    def __init__(self, path: str = REPLICA_PATH):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            with self._db:
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS people (
+                        id TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        rarity TEXT NOT NULL,
+                        description TEXT NOT NULL,
+                        weight REAL
+                    )
+                """)
+                columns = [row[1] for row in self._db.execute("PRAGMA table_info(people)")]
+                if "weight" not in columns:
+                    # Replica written before per-person weights were stored
+                    self._db.execute("ALTER TABLE people ADD COLUMN weight REAL")
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_people_rarity ON people (rarity)")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        key TEXT PRIMARY KEY,
+                        value REAL NOT NULL
+                    )
+                """)
+        return self._db
+
+    def save(self, people: List[Dict[str, Any]]) -> None:
+        """Replace the stored roster with `people` in a single transaction."""
+        rows = [
+            (person.get("id", ""), person.get("name", ""), person.get("rarity", ""),
+             person.get("description", ""), person.get(PERSON_WEIGHT_FIELD))
+            for person in people
+        ]
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute("DELETE FROM people")
+                db.executemany("INSERT OR REPLACE INTO people (id, name, rarity, description, weight) "
+                               "VALUES (?, ?, ?, ?, ?)", rows)
+                db.execute("INSERT OR REPLACE INTO sync_state VALUES ('synced_at', ?)", (time.time(),))
+
+    def load(self, rarity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read the stored roster, optionally only one rarity."""
+        query = "SELECT id, name, rarity, description, weight FROM people"
+        params: tuple = ()
+        if rarity is not None:
+            query += " WHERE rarity = ?"
+            params = (rarity,)
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        people = []
+        for row in rows:
+            person = {"id": row[0], "name": row[1], "rarity": row[2], "description": row[3]}
+            if row[4] is not None:
+                person[PERSON_WEIGHT_FIELD] = row[4]
+            people.append(person)
+        return people
+
+    def synced_at(self) -> Optional[float]:
+        """Unix time of the last successful save, or None if the replica is empty."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM sync_state WHERE key = 'synced_at'"
+            ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,175 @@
+"""
+Offline Monte Carlo check of the rarity distribution.
+
+Draws millions of rarities through the production sampler (no PocketBase
+needed), compares the observed counts with RARITY_WEIGHTS using a chi-square
+goodness-of-fit test, and prints a confidence interval per tier.
+
+    python simulate_rarity.py --draws 10000000 --seed 42 --workers 4
+"""
+
+import argparse
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from getRandomPerson import RARITY_WEIGHTS, get_rarity_sampler
+from rng_engine import RandomEngine
+
+# --- Configuration ---
+DEFAULT_DRAWS = 10_000_000
+CHUNK_SIZE = 2_000_000  # Draws per vectorised pass, bounds memory use
+DEFAULT_CONFIDENCE = 0.95
+SIGNIFICANCE_LEVEL = 0.01  # p-values below this are reported as a mismatch
+
+def _count_draws(draws: int, rng: np.random.Generator, chunk_size: int) -> np.ndarray:
+    sampler = get_rarity_sampler()
+    counts = np.zeros(len(sampler), dtype=np.int64)
+    remaining = draws
+    while remaining > 0:
+        k = min(chunk_size, remaining)
+        counts += np.bincount(sampler.draw_indices(k, rng), minlength=len(sampler))
+        remaining -= k
+    return counts
+
+def simulate(draws: int, seed: Optional[int] = None, workers: int = 1,
+             chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Draw rarities through the production sampler and count them.
+
+    Each worker draws from its own independent stream of the seeded engine,
+    so a run is reproducible for a given seed and number of workers.
+
+    Returns:
+        numpy.ndarray: Count per rarity, in RARITY_WEIGHTS order
+    """
+    engine = RandomEngine(seed)
+    if workers <= 1:
+        return _count_draws(draws, engine.numpy_generator(), chunk_size)
+
+    shares = [draws // workers + (1 if i < draws % workers else 0) for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda share, stream: _count_draws(share, stream.numpy_generator(), chunk_size),
+            shares, engine.spawn(workers)
+        )
+        return sum(results)
+
+def _upper_gamma_regularized(a: float, x: float) -> float:
+    """Q(a, x) = Γ(a, x) / Γ(a), via a series or continued fraction (Numerical Recipes 6.2)."""
+    if x <= 0:
+        return 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # Series for the lower function P(a, x), then Q = 1 - P
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+
+    # Lentz's continued fraction for Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * h
+
+def chi_square_test(observed: np.ndarray, expected_probabilities: List[float]) -> Tuple[float, int, float]:
+    """
+    Chi-square goodness-of-fit test.
+
+    Returns:
+        tuple: (statistic, degrees of freedom, p-value)
+    """
+    total = observed.sum()
+    expected = np.asarray(expected_probabilities) * total
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    dof = len(observed) - 1
+    return statistic, dof, _upper_gamma_regularized(dof / 2, statistic / 2)
+
+def wilson_interval(count: int, total: int, confidence: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = count / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return centre - margin, centre + margin
+
+def report(counts: np.ndarray, confidence: float) -> Dict[str, float]:
+    """Print the per-tier table and the chi-square result."""
+    sampler = get_rarity_sampler()
+    total = int(counts.sum())
+    ci_label = f"{confidence * 100:g}% CI"
+
+    print(f"\n{'Rarity':<7}{'Expected':>10}{'Observed':>10}  {ci_label:<22}{'Count':>12}")
+    print("-" * 61)
+    for rarity, probability, count in zip(sampler.items, sampler.probabilities, counts):
+        low, high = wilson_interval(int(count), total, confidence)
+        interval = f"[{low * 100:.3f}%, {high * 100:.3f}%]"
+        marker = "" if low <= probability <= high else "  ⚠️"
+        print(f"{rarity:<7}{probability * 100:>9.3f}%{count / total * 100:>9.3f}%  "
+              f"{interval:<22}{int(count):>12,}{marker}")
+
+    statistic, dof, p_value = chi_square_test(counts, sampler.probabilities)
+    print(f"\nChi-square: {statistic:.3f} (df={dof}), p-value: {p_value:.4f}")
+    if p_value < SIGNIFICANCE_LEVEL:
+        print(f"❌ Distribution does not match RARITY_WEIGHTS (p < {SIGNIFICANCE_LEVEL})")
+    else:
+        print("✅ Distribution matches RARITY_WEIGHTS")
+    return {"statistic": statistic, "dof": dof, "p_value": p_value}
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Simulate rarity draws and check them against RARITY_WEIGHTS')
+    parser.add_argument('--draws', type=int, default=DEFAULT_DRAWS,
+                       help=f'Number of simulated draws (default: {DEFAULT_DRAWS:,})')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for a reproducible run (default: random)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Threads drawing in parallel, each with its own random stream (default: 1)')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                       help=f'Confidence level of the per-tier intervals (default: {DEFAULT_CONFIDENCE})')
+    return parser.parse_args()
+
+def main():
+    """Run the simulation and print the results."""
+    args = parse_arguments()
+
+    print("Rarity Distribution Simulation")
+    print("-" * 30)
+    print(f"Weights: {RARITY_WEIGHTS}")
+    print(f"Simulating {args.draws:,} draws...")
+
+    start = time.perf_counter()
+    counts = simulate(args.draws, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.3f}s ({args.draws / elapsed / 1e6:.1f}M draws/s)")
+
+    report(counts, args.confidence)
+
+if __name__ == "__main__":
+    main()